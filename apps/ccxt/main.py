@@ -1,14 +1,32 @@
-import talib as ta
-import numpy as np
+import asyncio
+
+from os import environ
+from json import loads
+from collections import OrderedDict
+from ccxt import Exchange
 from sanic.request import Request
-from sanic.response import json
+from sanic.response import stream
+from sanic.exceptions import InvalidUsage
 from sanic import Blueprint
 from sanic_openapi3 import openapi
+from core.helpers import jsonapi
+from core.helpers.payload import Payload, response, json, project, dumps, render
+from domain.aggregate import Aggregator
+from domain.batch import Batch
+from domain.cache import ResponseCache, CacheResult
+from domain.candles import CandleStore
+from domain.indicators import IndicatorEngine, IndicatorBatch, IndicatorSpec
 from domain.models import *
+from domain.orderbook import LocalBook
 from domain.factory import ExchangeFactory
+from domain.limits import LimitsSource
+from domain.streams import StreamHub, StreamClient
 
 
 blueprint = Blueprint("ccxt")
+payloads = {}
+encoded = OrderedDict()
+cache = ResponseCache()
 
 
 def ccxt_headers(request: Request):
@@ -20,17 +38,137 @@ def ccxt_headers(request: Request):
     return params
 
 
+def batch_symbols(request: Request):
+    payload = request.json or {}
+    symbols = payload.get("symbols")
+
+    if not isinstance(symbols, list) or not symbols:
+        raise InvalidUsage("A non empty symbols list is required")
+
+    if len(symbols) > int(request.app.config.get("CCXT_BATCH_SIZE", 100)):
+        raise InvalidUsage("Too many symbols in one batch")
+
+    return list(dict.fromkeys(str(Symbol.parse(s)) for s in symbols))
+
+
+def integer(request: Request, key: str, default: int, minimum: int = None, maximum: int = None) -> int:
+    try:
+        value = int(request.args.get(key, default))
+    except ValueError:
+        raise InvalidUsage("%s must be an integer" % key)
+
+    if minimum is not None and value < minimum:
+        raise InvalidUsage("%s must be at least %d" % (key, minimum))
+
+    if maximum is not None and value > maximum:
+        raise InvalidUsage("%s must be at most %d" % (key, maximum))
+
+    return value
+
+
+def fields(request: Request) -> tuple:
+    return tuple(sorted({f for value in request.args.getlist("fields") or [] for f in value.split(",") if f}))
+
+
+def cache_headers(result: CacheResult):
+    return {
+        'X-Cache': result.status,
+        'X-Cache-Age': str(int(result.age * 1000)),
+        'Age': str(int(result.age)),
+    }
+
+
+def max_age(endpoint: str, result: CacheResult) -> int:
+    return max(0, int(ResponseCache.ttl(endpoint) / 1000 - result.age))
+
+
+def encode(key: tuple, data, _fields: tuple = ()) -> Payload:
+    if _fields and isinstance(data, (dict, list)):
+        # Names the data does not have select nothing, they must not each pin a copy of the same payload
+        sample = next(iter(data.values() if isinstance(data, dict) else data), None)
+        sample = sample.to_dict() if hasattr(sample, "to_dict") else sample
+        known = (set(data) if isinstance(data, dict) else set()) | (set(sample) if isinstance(sample, dict) else set())
+        _fields = tuple(f for f in _fields if f in known) or (None,)
+
+    # Markets, currencies and symbols are the same objects until the markets cache reloads them
+    key = key + (_fields,)
+    previous = encoded.get(key)
+
+    if previous is not None and previous[0] is data:
+        encoded.move_to_end(key)
+
+        return previous[1]
+
+    payload = Payload(project(data, _fields))
+    encoded[key] = (data, payload)
+    encoded.move_to_end(key)
+
+    while len(encoded) > int(environ.get("CCXT_ENCODED_SIZE", 64)):
+        encoded.popitem(last=False)
+
+    return payload
+
+
+def max_stale(request: Request, endpoint: str) -> float:
+    stale = ResponseCache.stale(endpoint)
+
+    for directive in request.headers.get("Cache-Control", "").split(","):
+        key, _, value = directive.strip().partition("=")
+
+        if key.lower() == "max-stale":
+            # Without a value the client accepts any age, bounded by our own ceiling
+            limit = float(request.app.config.get("CCXT_CACHE_MAX_STALE", 300000))
+            stale = max(stale, min(float(value) * 1000, limit) if value.isdigit() else limit)
+
+    return stale
+
+
+async def cached(request: Request, endpoint: str, key: tuple, load) -> CacheResult:
+    return await cache.fetch((endpoint,) + key, load, ResponseCache.ttl(endpoint), max_stale(request, endpoint))
+
+
+async def cached_ticker(name: str, symbol: Symbol, stale: float = 0) -> CacheResult:
+    async def load():
+        async with ExchangeFactory.acquire(name) as exchange:
+            return await exchange.ticker(symbol)
+
+    return await cache.fetch(('ticker', name, str(symbol)), load, ResponseCache.ttl('ticker'), stale)
+
+
+async def supported_timeframe(name: str, timeframe: str) -> str:
+    async with ExchangeFactory.acquire(name) as exchange:
+        # Candle feeds size their candles by the timeframe, a substituted one would be misread
+        if exchange.timeframe(timeframe) != timeframe:
+            raise InvalidUsage("%s does not support the %s timeframe" % (name, timeframe))
+
+    return timeframe
+
+
+@blueprint.listener('after_server_start')
+async def warm_exchanges(app, loop):
+    ExchangeFactory.features()
+    LimitsSource.start()
+
+
+@blueprint.listener('before_server_stop')
+async def close_exchanges(app, loop):
+    StreamHub.close()
+
+    await ExchangeFactory.close()
+    await LimitsSource.stop()
+
+    CandleStore.save()
+
+
 @blueprint.get("/")
 @openapi.summary("Fetches an exchanges list")
 @openapi.tag("info")
 @openapi.response(200, Dict[str, ExchangeFeatures])
 async def exchanges_list(request):
-    exchanges = {}
+    if 'exchanges' not in payloads:
+        payloads['exchanges'] = Payload(await ExchangeFactory.features())
 
-    async for key, exchange in ExchangeFactory.list():
-        exchanges[key] = exchange.features()
-
-    return json(exchanges)
+    return response(request, payloads['exchanges'], max_age=int(request.app.config.get("CCXT_EXCHANGES_MAX_AGE", 3600)))
 
 
 @blueprint.get("/<name:[A-z]+>/symbols")
@@ -38,74 +176,76 @@ async def exchanges_list(request):
 @openapi.tag("markets")
 @openapi.response(200, List[str])
 async def exchange_symbols(request, name):
-    exchange = await ExchangeFactory.load(name)
+    async def load():
+        async with ExchangeFactory.acquire(name) as exchange:
+            return encode(("symbols", name), await exchange.symbols())
 
-    try:
-        symbols = await exchange.symbols()
+    result = await cached(request, "symbols", (name,), load)
 
-        return json(symbols)
-    finally:
-        await exchange.close()
+    return response(request, result.value, headers=cache_headers(result), max_age=max_age("symbols", result))
 
 
 @blueprint.get("/<name:[A-z]+>/currencies")
 @openapi.summary("Fetches a exchange currencies list")
 @openapi.tag("markets")
+@openapi.parameter("fields", str)
 @openapi.response(200, List[Currency])
 async def exchange_currencies(request, name):
-    exchange = await ExchangeFactory.load(name)
+    _fields = fields(request)
 
-    try:
-        currencies = await exchange.currencies()
+    async def load():
+        async with ExchangeFactory.acquire(name) as exchange:
+            return encode(("currencies", name), await exchange.currencies(), _fields)
 
-        return json(currencies)
-    finally:
-        await exchange.close()
+    result = await cached(request, "currencies", (name, _fields), load)
+
+    return response(request, result.value, headers=cache_headers(result), max_age=max_age("currencies", result))
 
 
 @blueprint.get("/<name:[A-z]+>/markets")
 @openapi.summary("Load exchange markets list")
 @openapi.tag("markets")
+@openapi.parameter("fields", str)
 @openapi.response(200, List[Market])
 async def exchange_markets(request, name):
-    exchange = await ExchangeFactory.load(name)
+    _fields = fields(request)
 
-    try:
-        markets = await exchange.markets()
+    async def load():
+        async with ExchangeFactory.acquire(name) as exchange:
+            return encode(("markets", name), await exchange.markets(), _fields)
 
-        return json(markets)
-    finally:
-        await exchange.close()
+    result = await cached(request, "markets", (name, _fields), load)
+
+    return response(request, result.value, headers=cache_headers(result), max_age=max_age("markets", result))
 
 
 @blueprint.get("/<name:[A-z]+>/markets/<base:[A-z]+>/<quote:[A-z]+>")
 @openapi.summary("Fetches a list of all available markets from an exchange")
 @openapi.tag("markets")
+@openapi.parameter("fields", str)
 @openapi.response(200, Market)
 async def exchange_market(request, name, base, quote):
-    exchange = await ExchangeFactory.load(name)
-
-    try:
+    async with ExchangeFactory.acquire(name) as exchange:
         market = await exchange.market(Symbol(base, quote))
 
-        return json(market)
-    finally:
-        await exchange.close()
+        return json(project(market, fields(request)))
 
 
 @blueprint.get("/<name:[A-z]+>/tickers")
 @openapi.summary("Fetch price tickers for all symbols")
 @openapi.tag("tickers")
+@openapi.parameter("fields", str)
 @openapi.response(200, List[Ticker])
 async def exchange_tickers(request, name):
-    exchange = await ExchangeFactory.load(name)
+    async def load():
+        async with ExchangeFactory.acquire(name) as exchange:
+            return list((await exchange.tickers()).values())
 
-    try:
-        tickers = await exchange.tickers()
+    # One upstream call serves every fields variant, each projection is encoded once per cached value
+    result = await cached(request, "tickers", (name,), load)
+    payload = encode(("tickers", name), result.value, fields(request))
 
-        return json(tickers.values())
-    finally:
-        await exchange.close()
+    return response(request, payload, headers=cache_headers(result), max_age=max_age("tickers", result))
 
 
 @blueprint.get("/<name:[A-z]+>/tickers/<base:[A-z]+>/<quote:[A-z]+>")
@@ -113,14 +253,32 @@ async def exchange_tickers(request, name):
 @openapi.tag("tickers")
 @openapi.response(200, Ticker)
 async def exchange_ticker(request, name, base, quote):
-    exchange = await ExchangeFactory.load(name)
+    result = await cached_ticker(name, Symbol(base, quote), max_stale(request, "ticker"))
 
-    try:
-        ticker = await exchange.ticker(Symbol(base, quote))
+    return json(result.value, headers=cache_headers(result))
 
-        return json(ticker)
-    finally:
-        await exchange.close()
+
+@blueprint.get("/tickers/<base:[A-z]+>/<quote:[A-z]+>")
+@openapi.summary("Fetch best bid/ask for a symbol across several exchanges")
+@openapi.tag("tickers")
+@openapi.parameter("exchanges", str, desc="Comma separated exchange names")
+@openapi.parameter("timeout", int, desc="Per exchange budget in milliseconds")
+async def exchanges_ticker(request, base, quote):
+    names = list(dict.fromkeys(n for n in request.args.get("exchanges", "").split(",") if n))
+    timeout = integer(request, "timeout", request.app.config.get("CCXT_FANOUT_TIMEOUT", 2000), 1, 60000)
+
+    if not names:
+        raise InvalidUsage("At least one exchange is required")
+
+    if len(names) > int(request.app.config.get("CCXT_FANOUT_SIZE", 20)):
+        raise InvalidUsage("Too many exchanges in one request")
+
+    async def fetch(name: str, symbol: Symbol):
+        result = await cached_ticker(name, symbol)
+
+        return result.value
+
+    return json(await Aggregator.best(Symbol(base, quote), names, fetch, timeout))
 
 
 @blueprint.get("/<name:[A-z]+>/ohlcv/<base:[A-z]+>/<quote:[A-z]+>")
@@ -129,20 +287,44 @@ async def exchange_ticker(request, name, base, quote):
 @openapi.parameter("timeframe", str)
 @openapi.parameter("since", int)
 @openapi.parameter("limit", int)
+@openapi.parameter("format", str)
 @openapi.response(200, List[OHLCV])
 async def exchange_ohlcv(request, name, base, quote):
     timeframe = request.args.get("timeframe", None)
     since = request.args.get("since", None)
     limit = request.args.get("limit", None)
+    _format = request.args.get("format", "rows")
 
-    exchange = await ExchangeFactory.load(name)
-
-    try:
+    async with ExchangeFactory.acquire(name) as exchange:
         ohlcv = await exchange.ohlcv(Symbol(base, quote), timeframe, since, limit)
 
-        return json(ohlcv)
-    finally:
-        await exchange.close()
+        return render(request, ohlcv.columns() if _format == "columns" else ohlcv.records(), ohlcv.arrays)
+
+
+@blueprint.get("/<name:[A-z]+>/ohlcv/<base:[A-z]+>/<quote:[A-z]+>/stream")
+@openapi.summary("Streams the forming and closed OHLCV candles as Server-Sent Events")
+@openapi.tag("chart")
+@openapi.parameter("timeframe", str)
+async def exchange_ohlcv_stream(request, name, base, quote):
+    symbol = Symbol(base, quote)
+    timeframe = await supported_timeframe(name, request.args.get("timeframe", "1m"))
+    client = StreamClient(request.args.get("backpressure", None))
+
+    StreamHub.subscribe(client, name, "ohlcv", symbol, timeframe=timeframe)
+
+    async def events(response):
+        try:
+            while True:
+                message = await client.next()
+
+                if message is None:
+                    return
+
+                await response.write("event: %s\ndata: %s\n\n" % (message["type"], dumps(message["data"]).decode()))
+        finally:
+            StreamHub.leave(client)
+
+    return stream(events, content_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 
 @blueprint.get("/<name:[A-z]+>/trades/<base:[A-z]+>/<quote:[A-z]+>")
@@ -155,32 +337,78 @@ async def exchange_trades(request, name, base, quote):
     since = request.args.get("since", None)
     limit = request.args.get("limit", None)
 
-    exchange = await ExchangeFactory.load(name)
-
-    try:
+    async with ExchangeFactory.acquire(name) as exchange:
         trades = await exchange.trades(Symbol(base, quote), since, limit)
 
-        return json(trades)
-    finally:
-        await exchange.close()
+        return render(request, trades, lambda: TradeItem.columns(trades))
+
+
+async def cached_depth(name, symbol, limit):
+    async def load():
+        async with ExchangeFactory.acquire(name) as exchange:
+            return await exchange.depth(symbol, limit)
+
+    return await cache.fetch(('book', name, str(symbol), limit), load, ResponseCache.ttl('book'))
 
 
 @blueprint.get("/<name:[A-z]+>/book/<base:[A-z]+>/<quote:[A-z]+>")
 @openapi.summary("Fetch L2/L3 order book for a particular market trading symbol.")
 @openapi.tag("trades")
 @openapi.parameter("limit", int)
+@openapi.parameter("depth", int)
+@openapi.parameter("group", float)
 @openapi.response(200, OrderBook)
 async def exchange_book(request, name, base, quote):
-    exchange = await ExchangeFactory.load(name)
+    limit = request.args.get("limit", None)
+    depth = request.args.get("depth", None)
+    group = request.args.get("group", None)
+
+    try:
+        depth = int(depth) if depth else None
+        group = float(group) if group else None
+    except ValueError:
+        raise InvalidUsage("depth must be an integer and group a number")
+
+    if group is not None and group <= 0:
+        raise InvalidUsage("group must be positive")
 
+    result = await cached_depth(name, Symbol(base, quote), limit)
+    book = result.value.book(depth, group)
+
+    def columns():
+        levels = [("bid", o) for o in book.bids] + [("ask", o) for o in book.asks]
+
+        return {
+            "side": [side for side, _ in levels],
+            "price": [o.price for _, o in levels],
+            "amount": [o.amount for _, o in levels],
+        }
+
+    return render(request, book, columns, headers=cache_headers(result))
+
+
+@blueprint.get("/<name:[A-z]+>/book/<base:[A-z]+>/<quote:[A-z]+>/impact")
+@openapi.summary("Estimates the average fill price and slippage of a market order of the given size")
+@openapi.tag("trades")
+@openapi.parameter("amount", float)
+@openapi.parameter("side", str)
+@openapi.parameter("limit", int)
+async def exchange_book_impact(request, name, base, quote):
+    symbol = Symbol(base, quote)
     limit = request.args.get("limit", None)
+    side = request.args.get("side", LocalBook.BUY).lower()
 
     try:
-        book = await exchange.book(Symbol(base, quote), limit)
+        amount = float(request.args.get("amount", None))
+    except (TypeError, ValueError):
+        raise InvalidUsage("amount is required")
 
-        return json(book)
-    finally:
-        await exchange.close()
+    if amount <= 0 or side not in (LocalBook.BUY, LocalBook.SELL):
+        raise InvalidUsage("amount must be positive and side either buy or sell")
+
+    result = await cached_depth(name, symbol, limit)
+
+    return json(dict(result.value.impact(side, amount), symbol=str(symbol)), headers=cache_headers(result))
 
 
 @blueprint.get("/<name:[A-z]+>/indicators/<base:[A-z]+>/<quote:[A-z]+>")
@@ -190,36 +418,124 @@ async def exchange_book(request, name, base, quote):
 @openapi.parameter("fastPeriod", int)
 @openapi.parameter("slowPeriod", int)
 @openapi.parameter("signalPeriod", int)
+@openapi.parameter("ind", str, desc="Repeatable talib indicator, e.g. macd:12,26,9 or bbands:20")
+@openapi.parameter("full", bool, desc="Return the whole series instead of the last value")
 @openapi.response(200, Dict[str, float])
-async def exchange_ohlcv(request, name, base, quote):
+async def exchange_indicators(request, name, base, quote):
+    symbol = Symbol(base, quote)
     timeframe = request.args.get("timeframe", "15m")
-    fastPeriod = request.args.get("fastPeriod", 12)
-    slowPeriod = request.args.get("slowPeriod", 26)
-    signalPeriod = request.args.get("signalPeriod", 9)
+    # TA-Lib's MACD bounds
+    fastPeriod = integer(request, "fastPeriod", 12, 2, 100000)
+    slowPeriod = integer(request, "slowPeriod", 26, 2, 100000)
+    signalPeriod = integer(request, "signalPeriod", 9, 1, 100000)
+    specs = [IndicatorSpec.parse(v) for v in request.args.getlist("ind") or []]
+    full = request.args.get("full", "") in ("1", "true")
+
+    async with ExchangeFactory.acquire(name) as exchange:
+        # Unsupported timeframes are substituted, the engine needs the bar size of what was actually served
+        timeframe = exchange.timeframe(timeframe)
+        ohlcv = await exchange.ohlcv(symbol, timeframe)
+
+    key = (name, str(symbol), timeframe)
+
+    if specs:
+        return json(IndicatorBatch.compute(key, ohlcv, specs, full))
+
+    size = Exchange.parse_timeframe(timeframe) * 1000
+
+    return json(IndicatorEngine.compute(key, ohlcv, size, fastPeriod, slowPeriod, signalPeriod))
+
+
+@blueprint.post("/<name:[A-z]+>/batch/tickers")
+@openapi.summary("Fetch price tickers for a list of symbols")
+@openapi.tag("batch")
+@openapi.response(200, Dict[str, Ticker])
+async def batch_tickers(request, name):
+    symbols = batch_symbols(request)
 
-    exchange = await ExchangeFactory.load(name)
+    async with ExchangeFactory.acquire(name) as exchange:
+        data, errors = await Batch.tickers(exchange, symbols)
+
+        return json(jsonapi.batch(data, errors))
+
+
+@blueprint.post("/<name:[A-z]+>/batch/books")
+@openapi.summary("Fetch order books for a list of symbols")
+@openapi.tag("batch")
+@openapi.response(200, Dict[str, OrderBook])
+async def batch_books(request, name):
+    symbols = batch_symbols(request)
+    limit = request.json.get("limit", None)
+
+    async with ExchangeFactory.acquire(name) as exchange:
+        data, errors = await Batch.run(symbols, lambda s: exchange.book(Symbol.parse(s), limit), exchange.concurrency())
+
+        return json(jsonapi.batch(data, errors))
+
+
+@blueprint.post("/<name:[A-z]+>/batch/ohlcv")
+@openapi.summary("Fetches OHLCV data for a list of symbols")
+@openapi.tag("batch")
+@openapi.response(200, Dict[str, List[OHLCV]])
+async def batch_ohlcv(request, name):
+    symbols = batch_symbols(request)
+    timeframe = request.json.get("timeframe", None)
+    since = request.json.get("since", None)
+    limit = request.json.get("limit", None)
+    _format = request.json.get("format", "rows")
+
+    async def ohlcv(symbol: str):
+        candles = await exchange.ohlcv(Symbol.parse(symbol), timeframe, since, limit)
+
+        return candles.columns() if _format == "columns" else candles.records()
+
+    async with ExchangeFactory.acquire(name) as exchange:
+        data, errors = await Batch.run(symbols, ohlcv, exchange.concurrency())
+
+        return json(jsonapi.batch(data, errors))
+
+
+@blueprint.websocket("/stream")
+async def stream_subscriptions(request, ws):
+    client = StreamClient(request.args.get("backpressure", None))
+
+    async def pump():
+        while True:
+            message = await client.next()
+
+            if message is None:
+                await ws.close()
+
+                return
+
+            await ws.send(dumps(message).decode())
+
+    sender = asyncio.ensure_future(pump())
 
     try:
-        ohlcv = await exchange.ohlcv(Symbol(base, quote), timeframe)
-        close = np.array([v['c'] for v in ohlcv], float)
-        volume = np.array([v['v'] for v in ohlcv], float)
-
-        macd, sig, hist = ta.MACD(close, fastperiod=fastPeriod, slowperiod=slowPeriod, signalperiod=signalPeriod)
-        obv = ta.OBV(close, volume)
-
-        rsi = ta.RSI(close, timeperiod=14)
-        rsf = ta.RSI(close, timeperiod=5)
-
-        return json({
-            'hist': hist[-1],
-            'macd': macd[-1],
-            'sig': sig[-1],
-            'rsi': rsi[-1],
-            'rsf': rsf[-1],
-            'obv': obv[-1],
-        })
+        while not sender.done():
+            data = await ws.recv()
+
+            if data is None:
+                break
+
+            try:
+                command = loads(data)
+                symbol = Symbol.parse(command["symbol"])
+                options = {"timeframe": command.get("timeframe", "1m")} if command["channel"] == "ohlcv" else {}
+
+                if command.get("op") == "unsubscribe":
+                    StreamHub.unsubscribe(client, StreamHub.key(command["exchange"], command["channel"], symbol, **options))
+                else:
+                    if options:
+                        await supported_timeframe(command["exchange"], options["timeframe"])
+
+                    StreamHub.subscribe(client, command["exchange"], command["channel"], symbol, **options)
+            except Exception as error:
+                client.push(None, {"type": "error", "data": jsonapi.error(error, "Invalid Subscription")})
     finally:
-        await exchange.close()
+        sender.cancel()
+        StreamHub.leave(client)
 
 
 @blueprint.get("/<name:[A-z]+>/wallet/")
@@ -227,14 +543,10 @@ async def exchange_ohlcv(request, name, base, quote):
 @openapi.summary("Fetches authorized account balances")
 @openapi.response(200, Wallet)
 async def exchange_wallets(request, name):
-    exchange = await ExchangeFactory.load(name, ccxt_headers(request))
-
-    try:
+    async with ExchangeFactory.acquire(name, ccxt_headers(request)) as exchange:
         wallet = await exchange.wallet()
 
         return json(wallet)
-    finally:
-        await exchange.close()
 
 
 @blueprint.get("/<name:[A-z]+>/wallet/<base:[A-z]+>")
@@ -242,14 +554,10 @@ async def exchange_wallets(request, name):
 @openapi.summary("Fetches authorized account balance")
 @openapi.response(200, Balance)
 async def exchange_wallet(request, name, base):
-    exchange = await ExchangeFactory.load(name, ccxt_headers(request))
-
-    try:
+    async with ExchangeFactory.acquire(name, ccxt_headers(request)) as exchange:
         balance = await exchange.balance(base)
 
         return json(balance)
-    finally:
-        await exchange.close()
 
 
 @blueprint.get("/<name:[A-z]+>/orders/<base:[A-z]+>/<quote:[A-z]+>")
@@ -260,18 +568,14 @@ async def exchange_wallet(request, name, base):
 @openapi.parameter("status", str)
 @openapi.response(200, List[Order])
 async def orders_list(request, name, base, quote):
-    exchange = await ExchangeFactory.load(name, ccxt_headers(request))
-
     since = request.args.get("since", None)
     limit = request.args.get("limit", None)
     status = request.args.get("status", None)
 
-    try:
+    async with ExchangeFactory.acquire(name, ccxt_headers(request)) as exchange:
         orders = await exchange.get_orders(Symbol(base, quote), status, since, limit)
 
         return json(orders)
-    finally:
-        await exchange.close()
 
 
 @blueprint.get("/<name:[A-z]+>/orders/<base:[A-z]+>/<quote:[A-z]+>/<id>")
@@ -280,14 +584,10 @@ async def orders_list(request, name, base, quote):
 @openapi.response(200, Order, desc="Order object")
 @openapi.response(404, desc="Order not found")
 async def orders_get(request, name, base, quote, id):
-    exchange = await ExchangeFactory.load(name, ccxt_headers(request))
-
-    try:
+    async with ExchangeFactory.acquire(name, ccxt_headers(request)) as exchange:
         order = await exchange.get_order(Symbol(base, quote), id)
 
         return json(order)
-    finally:
-        await exchange.close()
 
 
 @blueprint.post("/<name:[A-z]+>/orders/<base:[A-z]+>/<quote:[A-z]+>")
@@ -296,21 +596,18 @@ async def orders_get(request, name, base, quote, id):
 @openapi.response(201, Order, desc="Order created")
 @openapi.response(406, desc="Min order amount not reached")
 async def orders_place(request, name, base, quote):
-    exchange = await ExchangeFactory.load(name, ccxt_headers(request))
-
     payload = request.json
 
     _type = payload["type"] if "type" in payload else "market"
     _side = payload["side"] if "side" in payload else "sell"
     _amount = float(payload["amount"])
     _price = float(payload["price"]) if _type == "limit" else None
+    _client_id = payload.get("clientOrderId", None)
 
-    try:
-        order = await exchange.create_order(Symbol(base, quote), _type, _side, _amount, _price)
+    async with ExchangeFactory.acquire(name, ccxt_headers(request)) as exchange:
+        order = await exchange.create_order(Symbol(base, quote), _type, _side, _amount, _price, _client_id)
 
         return json(order, 201)
-    finally:
-        await exchange.close()
 
 
 @blueprint.delete("/<name:[A-z]+>/orders/<base:[A-z]+>/<quote:[A-z]+>/<id>")
@@ -319,11 +616,7 @@ async def orders_place(request, name, base, quote):
 @openapi.response(204, desc="Order removed")
 @openapi.response(404, desc="Order not found")
 async def orders_cancel(request, name, base, quote, id):
-    exchange = await ExchangeFactory.load(name, ccxt_headers(request))
-
-    try:
+    async with ExchangeFactory.acquire(name, ccxt_headers(request)) as exchange:
         await exchange.cancel_order(Symbol(base, quote), id)
 
         return json(None, 204)
-    finally:
-        await exchange.close()
@@ -0,0 +1,22 @@
+from sanic import Blueprint
+from sanic.response import json
+from sanic_openapi3 import openapi
+
+from domain.breaker import CircuitBreaker
+from domain.limits import LimitsSource
+
+blueprint = Blueprint("status")
+
+
+@blueprint.get("/status/limits")
+@openapi.summary("Shows when the exchange limits were last loaded and how long it took")
+@openapi.tag("status")
+async def status_limits(request):
+    return json(dict(LimitsSource.stats, interval=LimitsSource.interval(), running=LimitsSource.task is not None))
+
+
+@blueprint.get("/status/breakers")
+@openapi.summary("Lists the circuit breaker state of every exchange used so far")
+@openapi.tag("status")
+async def status_breakers(request):
+    return json({name: breaker.status() for name, breaker in CircuitBreaker.breakers.items()})
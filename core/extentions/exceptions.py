@@ -19,6 +19,11 @@ def handle_invalid_symbol(request, exception):
     return json(jsonapi.error(exception, 'Invalid Symbol'), status=HTTPStatus.UNPROCESSABLE_ENTITY)
 
 
+@blueprint.exception(InvalidIndicator)
+def handle_invalid_indicator(request, exception):
+    return json(jsonapi.error(exception, 'Invalid Indicator'), status=HTTPStatus.UNPROCESSABLE_ENTITY)
+
+
 @blueprint.exception(InvalidOperation)
 def handle_invalid_operation(request, exception):
     return json(jsonapi.error(exception, 'Invalid Operation'), status=HTTPStatus.UNPROCESSABLE_ENTITY)
@@ -39,6 +44,13 @@ def handle_invalid_order(request, exception):
     return json(jsonapi.error(exception, 'Min Order Amount'), status=HTTPStatus.NOT_ACCEPTABLE)
 
 
+@blueprint.exception(ExchangeUnavailable)
+def handle_exchange_unavailable(request, exception):
+    headers = {'Retry-After': str(int(exception.retry_after + 1))} if exception.retry_after is not None else None
+
+    return json(jsonapi.error(exception, 'Exchange Unavailable'), status=HTTPStatus.SERVICE_UNAVAILABLE, headers=headers)
+
+
 @blueprint.exception(ExchangeError)
 def handle_exchange_error(request, exception):
     return json(jsonapi.error(exception, 'Exchange Error'), status=HTTPStatus.UNPROCESSABLE_ENTITY)
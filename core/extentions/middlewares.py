@@ -1,14 +1,101 @@
+import gzip
+
 from http import HTTPStatus
+from collections import OrderedDict
 
 from sanic import Blueprint
 from sanic.response import json
 from core.helpers import jsonapi
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 DEFAULT_TYPE = 'application/vnd.api+json'
 SUPPORTED_TYPES = [DEFAULT_TYPE, 'application/json']
+COMPRESSIBLE_TYPES = ['json', 'text/', 'msgpack', 'arrow', 'xml', 'javascript']
 
 blueprint = Blueprint('core.extentions.middlewares')
 
+# Compressed bodies of responses carrying a content hash ETag, keyed by (etag, encoding)
+compressed = OrderedDict()
+
+
+def accepted_encoding(request):
+    accepted = {}
+
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        name, _, params = part.strip().lower().partition(';')
+        q = params.strip()[2:] if params.strip().startswith('q=') else '1'
+
+        try:
+            accepted[name.strip()] = float(q)
+        except ValueError:
+            continue
+
+    if brotli is not None and accepted.get('br', 0) > 0:
+        return 'br'
+
+    if accepted.get('gzip', 0) > 0:
+        return 'gzip'
+
+    return None
+
+
+def compress(body, encoding, level):
+    if encoding == 'br':
+        return brotli.compress(body, quality=level)
+
+    return gzip.compress(body, compresslevel=level)
+
+
+@blueprint.middleware('response')
+def compress_response(request, response):
+    """Compressing response bodies above the configured size
+
+    Uses brotli when it is installed and accepted by the client, gzip
+    otherwise. Responses with an ETag are compressed once and served
+    from a small cache afterwards, the ETag being a hash of the body
+    """
+    body = getattr(response, 'body', None)
+
+    if not body or response.status in (HTTPStatus.NO_CONTENT, HTTPStatus.NOT_MODIFIED):
+        return
+
+    if 'Content-Encoding' in response.headers or len(body) < int(request.app.config.get('CCXT_COMPRESS_MIN', 1024)):
+        return
+
+    if not any(t in (response.content_type or '') for t in COMPRESSIBLE_TYPES):
+        return
+
+    encoding = accepted_encoding(request)
+
+    if encoding is None:
+        return
+
+    level = int(request.app.config.get('CCXT_COMPRESS_%s_LEVEL' % encoding.upper(), 4 if encoding == 'br' else 6))
+    etag = response.headers.get('ETag')
+
+    if etag is None:
+        response.body = compress(body, encoding, level)
+    else:
+        key = (etag, encoding)
+
+        if key not in compressed:
+            compressed[key] = compress(body, encoding, level)
+
+            while len(compressed) > int(request.app.config.get('CCXT_COMPRESS_CACHE', 256)):
+                compressed.popitem(last=False)
+
+        compressed.move_to_end(key)
+        response.body = compressed[key]
+
+    vary = response.headers.get('Vary')
+
+    response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = '%s, Accept-Encoding' % vary if vary else 'Accept-Encoding'
+
 
 # @blueprint.middleware('response')
 # def jsonapi_standard_response_header(request, response):
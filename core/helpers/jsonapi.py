@@ -7,3 +7,15 @@ def error(exception: Exception, title: str):
             }
         ]
     }
+
+
+def batch(data: dict, errors: dict):
+    return {
+        'data': data,
+        'errors': {
+            key: {
+                'title': exception.__class__.__name__,
+                'detail': str(exception),
+            } for key, exception in errors.items()
+        },
+    }
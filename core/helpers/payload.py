@@ -0,0 +1,156 @@
+import hashlib
+import json as _json
+import numpy as np
+
+from time import time
+from decimal import Decimal
+from email.utils import formatdate, parsedate_to_datetime
+from sanic.request import Request
+from sanic.response import raw, HTTPResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+JSON = 'application/json'
+MSGPACK = 'application/msgpack'
+ARROW = 'application/vnd.apache.arrow.stream'
+
+
+def default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    if hasattr(value, '__dict__'):
+        return vars(value)
+
+    raise TypeError('%s is not JSON serializable' % value.__class__.__name__)
+
+
+def dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, default=default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+    return _json.dumps(data, default=default, separators=(',', ':')).encode()
+
+
+def project(data, fields: list):
+    """Keeps only the given keys of an object, of every item of a list, or of every value of a keyed map"""
+    if not fields:
+        return data
+
+    # Slotted models are projected from their encoded form
+    if hasattr(data, 'to_dict'):
+        data = data.to_dict()
+
+    if isinstance(data, list):
+        return [project(item, fields) for item in data]
+
+    if isinstance(data, dict) and data and all(isinstance(v, dict) or hasattr(v, 'to_dict') for v in data.values()) \
+            and not set(fields) & set(data):
+        return {key: project(value, fields) for key, value in data.items()}
+
+    if isinstance(data, dict):
+        return {key: data[key] for key in fields if key in data}
+
+    return data
+
+
+class Payload(object):
+    body: bytes
+    etag: str
+    modified: float
+
+    def __init__(self, data):
+        self.body = dumps(data)
+        self.etag = '"%s"' % hashlib.sha1(self.body).hexdigest()
+        self.modified = time()
+
+    def matches(self, request: Request) -> bool:
+        tags = request.headers.get('If-None-Match')
+
+        if tags is not None:
+            # Weak comparison, the body hash is the same whichever encoding the client received
+            return any(tag.strip() in ('*', self.etag, 'W/' + self.etag) for tag in tags.split(','))
+
+        since = request.headers.get('If-Modified-Since')
+
+        try:
+            return since is not None and parsedate_to_datetime(since).timestamp() >= int(self.modified)
+        except (TypeError, ValueError):
+            return False
+
+
+def json(body, status: int = 200, headers: dict = None) -> HTTPResponse:
+    return raw(dumps(body), status=status, headers=headers, content_type='application/json')
+
+
+def response(request: Request, payload: Payload, status: int = 200, headers: dict = None, max_age: int = None) -> HTTPResponse:
+    headers = dict(headers or {}, ETag=payload.etag)
+    headers['Last-Modified'] = formatdate(payload.modified, usegmt=True)
+
+    if max_age is not None:
+        headers['Cache-Control'] = 'public, max-age=%d' % max_age
+
+    if payload.matches(request):
+        return raw(b'', status=304, headers=headers)
+
+    return raw(payload.body, status=status, headers=headers, content_type='application/json')
+
+
+def negotiate(request: Request, columnar: bool = False) -> str:
+    accept = [part.split(';')[0].strip().lower() for part in request.headers.get('Accept', '').split(',')]
+
+    # Binary formats are opt-in and only offered when their library is installed
+    for content_type in accept:
+        if content_type == ARROW and pyarrow is not None and columnar:
+            return ARROW
+        if content_type in (MSGPACK, 'application/x-msgpack') and msgpack is not None:
+            return MSGPACK
+
+    return JSON
+
+
+def arrow(columns: dict) -> bytes:
+    # NaN marks a missing value everywhere else, so it becomes null here too
+    arrays = [pyarrow.array(values, from_pandas=True) for values in columns.values()]
+    batch = pyarrow.RecordBatch.from_arrays(arrays, names=list(columns))
+    sink = pyarrow.BufferOutputStream()
+
+    with pyarrow.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+
+    return sink.getvalue().to_pybytes()
+
+
+def render(request: Request, data, columns=None, status: int = 200, headers: dict = None) -> HTTPResponse:
+    """Encodes data as the client asked, columns is a callable returning the same data as named columns"""
+    content_type = negotiate(request, columns is not None)
+    headers = dict(headers or {}, Vary='Accept')
+
+    if content_type == ARROW:
+        body = arrow(columns())
+    elif content_type == MSGPACK:
+        body = msgpack.packb(data, default=default)
+    else:
+        body = dumps(data)
+
+    return raw(body, status=status, headers=headers, content_type=content_type)
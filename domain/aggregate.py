@@ -0,0 +1,76 @@
+import asyncio
+
+from time import monotonic
+from typing import Dict, List
+
+from domain.models import Symbol, Ticker
+
+
+class VenueQuote(object):
+    exchange: str
+    bid: float
+    bidVolume: float
+    ask: float
+    askVolume: float
+    latency: float
+    error: Exception
+
+    def __init__(self, exchange: str, latency: float, ticker: Ticker = None, error: Exception = None):
+        ticker = ticker or Ticker()
+
+        self.exchange = exchange
+        self.bid = ticker.bid
+        self.bidVolume = ticker.bidVolume
+        self.ask = ticker.ask
+        self.askVolume = ticker.askVolume
+        self.latency = latency
+        self.error = error
+
+    def to_dict(self) -> Dict:
+        if self.error is not None:
+            return {
+                'latency': self.latency,
+                'error': {
+                    'title': self.error.__class__.__name__,
+                    'detail': str(self.error) or 'Timed out',
+                },
+            }
+
+        return {
+            'bid': self.bid,
+            'bidVolume': self.bidVolume,
+            'ask': self.ask,
+            'askVolume': self.askVolume,
+            'latency': self.latency,
+        }
+
+
+class Aggregator(object):
+    @staticmethod
+    async def quote(name: str, symbol: Symbol, fetch, timeout: float) -> VenueQuote:
+        started = monotonic()
+
+        try:
+            ticker = await asyncio.wait_for(fetch(name, symbol), timeout / 1000)
+
+            return VenueQuote(name, round((monotonic() - started) * 1000, 3), ticker)
+        except Exception as error:
+            return VenueQuote(name, round((monotonic() - started) * 1000, 3), error=error)
+
+    @staticmethod
+    async def best(symbol: Symbol, names: List[str], fetch, timeout: float) -> Dict:
+        quotes = await asyncio.gather(*[Aggregator.quote(name, symbol, fetch, timeout) for name in names])
+
+        bids = [q for q in quotes if q.error is None and q.bid is not None]
+        asks = [q for q in quotes if q.error is None and q.ask is not None]
+
+        bid = max(bids, key=lambda q: q.bid) if bids else None
+        ask = min(asks, key=lambda q: q.ask) if asks else None
+
+        return {
+            'symbol': str(symbol),
+            'bid': {'exchange': bid.exchange, 'price': bid.bid, 'amount': bid.bidVolume} if bid else None,
+            'ask': {'exchange': ask.exchange, 'price': ask.ask, 'amount': ask.askVolume} if ask else None,
+            'spread': ask.ask - bid.bid if bid and ask else None,
+            'venues': {q.exchange: q.to_dict() for q in quotes},
+        }
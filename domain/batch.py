@@ -0,0 +1,47 @@
+import asyncio
+
+from typing import Dict, List, Tuple
+from ccxt import ExchangeError, AuthenticationError
+
+from domain.errors import InvalidSymbol
+from domain.models import ExchangeProxy, Symbol
+
+
+class Batch(object):
+    @staticmethod
+    async def run(keys: List[str], call, concurrency: int) -> Tuple[Dict[str, object], Dict[str, Exception]]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(key: str):
+            async with semaphore:
+                try:
+                    return key, await call(key), None
+                except Exception as error:
+                    return key, None, error
+
+        results = await asyncio.gather(*[one(key) for key in keys])
+
+        data = {key: value for key, value, error in results if error is None}
+        errors = {key: error for key, _, error in results if error is not None}
+
+        return data, errors
+
+    @staticmethod
+    async def tickers(exchange: ExchangeProxy, symbols: List[str]) -> Tuple[Dict[str, object], Dict[str, Exception]]:
+        if exchange.features().get('fetchTickers'):
+            try:
+                tickers = await exchange.tickers([Symbol.parse(s) for s in symbols])
+            except AuthenticationError:
+                raise
+            except ExchangeError:
+                # One bad symbol fails the whole call, retry one by one to report it per item.
+                # Network failures are raised instead, fanning out would only add load to a struggling venue
+                tickers = None
+
+            if tickers is not None:
+                data = {s: tickers[s] for s in symbols if s in tickers}
+                errors = {s: InvalidSymbol(s) for s in symbols if s not in tickers}
+
+                return data, errors
+
+        return await Batch.run(symbols, lambda s: exchange.ticker(Symbol.parse(s)), exchange.concurrency())
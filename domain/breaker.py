@@ -0,0 +1,148 @@
+from os import environ
+from time import monotonic
+from collections import deque
+
+from ccxt import NetworkError, DDoSProtection, RateLimitExceeded
+
+from domain.errors import ExchangeUnavailable
+
+
+def timeout(name: str, method: str = None) -> int:
+    """Request timeout in milliseconds, the most specific of CCXT_TIMEOUT_<NAME>_<METHOD>, _<METHOD>, _<NAME>"""
+    keys = ['CCXT_TIMEOUT_%s' % name.upper()]
+
+    if method is not None:
+        keys = ['CCXT_TIMEOUT_%s_%s' % (name.upper(), method.upper()), 'CCXT_TIMEOUT_%s' % method.upper()] + keys
+
+    for key in keys:
+        if key in environ:
+            return int(environ[key])
+
+    return int(environ.get('CCXT_TIMEOUT', 30000))
+
+
+class CircuitBreaker(object):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    breakers = {}
+
+    name: str
+    state: str
+    calls: deque
+    opened: float
+    probes: int
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = self.CLOSED
+        self.calls = deque()
+        self.opened = 0.0
+        self.probes = 0
+        self.trips = 0
+
+    @classmethod
+    def get(cls, name: str) -> 'CircuitBreaker':
+        if name not in cls.breakers:
+            cls.breakers[name] = CircuitBreaker(name)
+
+        return cls.breakers[name]
+
+    @staticmethod
+    def option(key: str, default: float) -> float:
+        return float(environ.get('CCXT_BREAKER_%s' % key, default))
+
+    def retry_after(self) -> float:
+        return max(0.0, self.opened + self.option('COOLDOWN', 30) - monotonic())
+
+    def allow(self) -> bool:
+        if self.state == self.OPEN and self.retry_after() == 0:
+            self.state = self.HALF_OPEN
+            self.probes = 0
+
+        if self.state == self.HALF_OPEN:
+            # Let a few probes through, everybody else keeps failing fast until they report back
+            if self.probes >= self.option('PROBES', 1):
+                return False
+
+            self.probes += 1
+
+        return self.state != self.OPEN
+
+    def record(self, failed: bool, latency: float):
+        now = monotonic()
+
+        if self.state == self.HALF_OPEN:
+            self.probes -= 1
+
+            if failed or latency > self.option('SLOW', 5000) / 1000:
+                self._open(now)
+            else:
+                self.state = self.CLOSED
+                self.calls.clear()
+
+            return
+
+        self.calls.append((now, failed, latency))
+
+        while self.calls and now - self.calls[0][0] > self.option('WINDOW', 30):
+            self.calls.popleft()
+
+        if self.state == self.CLOSED and len(self.calls) >= self.option('CALLS', 10):
+            errors = sum(1 for _, f, _ in self.calls if f) / len(self.calls)
+            slow = sum(1 for _, _, l in self.calls if l > self.option('SLOW', 5000) / 1000) / len(self.calls)
+
+            if errors >= self.option('ERRORS', 0.5) or slow >= self.option('SLOW_RATE', 0.8):
+                self._open(now)
+
+    async def call(self, call):
+        if not self.allow():
+            raise ExchangeUnavailable('%s is unavailable, retry in %.0f seconds' % (self.name, self.retry_after()), self.retry_after())
+
+        started = monotonic()
+
+        try:
+            result = await call()
+        except (DDoSProtection, RateLimitExceeded):
+            # Throttled (429 and the like), the venue answered and the rate limiter backs off, not the breaker
+            self.record(False, monotonic() - started)
+
+            raise
+        except NetworkError:
+            # Only transport failures count against the venue, rejected requests mean it is up
+            self.record(True, monotonic() - started)
+
+            raise
+        except Exception:
+            self.record(False, monotonic() - started)
+
+            raise
+        except BaseException:
+            # Cancelled by the caller, the call says nothing about the venue
+            if self.state == self.HALF_OPEN:
+                self.probes -= 1
+
+            raise
+
+        self.record(False, monotonic() - started)
+
+        return result
+
+    def status(self) -> dict:
+        calls = len(self.calls)
+
+        return {
+            'state': self.state,
+            'calls': calls,
+            'errors': sum(1 for _, f, _ in self.calls if f),
+            'latency': round(sum(l for _, _, l in self.calls) / calls * 1000, 3) if calls else None,
+            'trips': self.trips,
+            'retry_after': round(self.retry_after(), 3) if self.state == self.OPEN else None,
+        }
+
+    def _open(self, now: float):
+        self.state = self.OPEN
+        self.opened = now
+        self.trips += 1
+        self.calls.clear()
@@ -0,0 +1,161 @@
+import sys
+import asyncio
+
+from os import environ
+from time import monotonic
+from itertools import islice
+from collections import OrderedDict
+
+from domain.errors import ExchangeUnavailable
+
+
+def sizeof(value, depth: int = 4) -> int:
+    size = sys.getsizeof(value)
+
+    if depth == 0:
+        return size
+
+    if isinstance(value, dict):
+        items = list(islice(value.items(), 16))
+        sample = sum(sizeof(k, depth - 1) + sizeof(v, depth - 1) for k, v in items)
+    elif isinstance(value, (list, tuple, set)):
+        items = list(islice(value, 16))
+        sample = sum(sizeof(v, depth - 1) for v in items)
+    elif hasattr(value, '__dict__'):
+        return size + sizeof(vars(value), depth - 1)
+    elif hasattr(value, '__slots__'):
+        return size + sum(sizeof(getattr(value, k, None), depth - 1) for k in value.__slots__)
+    else:
+        return size
+
+    # Extrapolate from the first few items, large payloads are homogeneous
+    return size + (sample * len(value) // len(items) if items else 0)
+
+
+class CacheEntry(object):
+    value: object
+    size: int
+    created: float
+
+    def __init__(self, value):
+        self.value = value
+        self.size = sizeof(value)
+        self.created = monotonic()
+
+    def age(self) -> float:
+        return monotonic() - self.created
+
+
+class CacheResult(object):
+    HIT = 'HIT'
+    MISS = 'MISS'
+    SHARED = 'SHARED'
+    STALE = 'STALE'
+
+    value: object
+    status: str
+    age: float
+
+    def __init__(self, entry: CacheEntry, status: str):
+        self.value = entry.value
+        self.status = status
+        self.age = entry.age()
+
+
+class ResponseCache(object):
+    TTL = {
+        'ticker': 1000,
+        'tickers': 2000,
+        'book': 500,
+        'symbols': 60000,
+        'currencies': 60000,
+        'markets': 60000,
+    }
+
+    size: int
+    used: int
+    entries: OrderedDict
+    pending: dict
+
+    def __init__(self, size: int = None):
+        self.size = size
+        self.used = 0
+        self.entries = OrderedDict()
+        self.pending = {}
+
+    @staticmethod
+    def ttl(endpoint: str) -> float:
+        return float(environ.get('CCXT_CACHE_%s_TTL' % endpoint.upper(), ResponseCache.TTL.get(endpoint, 0)))
+
+    @staticmethod
+    def stale(endpoint: str) -> float:
+        return float(environ.get('CCXT_CACHE_%s_STALE' % endpoint.upper(), 0))
+
+    def capacity(self) -> int:
+        return self.size or int(environ.get('CCXT_CACHE_SIZE', 64 * 1024 * 1024))
+
+    async def fetch(self, key: tuple, loader, ttl: float, stale: float = 0) -> CacheResult:
+        entry = self.entries.get(key)
+
+        if entry is not None and entry.age() * 1000 < ttl:
+            self.entries.move_to_end(key)
+
+            return CacheResult(entry, CacheResult.HIT)
+
+        status = CacheResult.SHARED if key in self.pending else CacheResult.MISS
+        future = self._start(key, loader)
+
+        # Stale while revalidate, answer right away and let the refresh land for the next request
+        if entry is not None and entry.age() * 1000 < ttl + stale:
+            self.entries.move_to_end(key)
+
+            return CacheResult(entry, CacheResult.STALE)
+
+        try:
+            # Shielded so one disconnecting client does not cancel the fetch for everybody else
+            fresh = await asyncio.shield(future)
+        except ExchangeUnavailable:
+            # The venue's breaker is open, old data beats no data
+            if entry is None:
+                raise
+
+            return CacheResult(entry, CacheResult.STALE)
+
+        return CacheResult(fresh, status)
+
+    def _start(self, key: tuple, loader) -> asyncio.Future:
+        future = self.pending.get(key)
+
+        if future is None:
+            future = asyncio.ensure_future(self._load(key, loader))
+            future.add_done_callback(lambda f: self._done(key, f))
+
+            self.pending[key] = future
+
+        return future
+
+    def invalidate(self, key: tuple):
+        entry = self.entries.pop(key, None)
+
+        if entry is not None:
+            self.used -= entry.size
+
+    async def _load(self, key: tuple, loader) -> CacheEntry:
+        entry = CacheEntry(await loader())
+
+        self.invalidate(key)
+
+        self.entries[key] = entry
+        self.used += entry.size
+
+        while self.used > self.capacity() and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.used -= evicted.size
+
+        return entry
+
+    def _done(self, key: tuple, future: asyncio.Future):
+        self.pending.pop(key, None)
+
+        if not future.cancelled():
+            future.exception()
@@ -0,0 +1,207 @@
+import asyncio
+import numpy as np
+
+from os import environ, path, makedirs
+from time import monotonic
+from typing import List, Tuple
+
+from ccxt.async_support.base.exchange import Exchange
+
+from domain.models import Candles
+
+
+class CandleSeries(object):
+    timeframe: int
+    data: np.ndarray
+    ranges: List[List[int]]
+    forming: Tuple[int, float]
+    dirty: bool
+
+    def __init__(self, timeframe: int, data: np.ndarray = None, ranges: list = None):
+        self.timeframe = timeframe
+        self.data = data if data is not None else np.empty((len(Candles.COLUMNS), 0))
+        self.ranges = ranges or []
+        self.forming = (0, 0.0)
+        self.dirty = False
+        self.lock = asyncio.Lock()
+
+    def missing(self, start: int, end: int) -> List[Tuple[int, int]]:
+        gaps = []
+
+        for s, e in self.ranges:
+            if e <= start:
+                continue
+            if s >= end:
+                break
+            if s > start:
+                gaps.append((start, s))
+
+            start = max(start, e)
+
+        if start < end:
+            gaps.append((start, end))
+
+        return gaps
+
+    def cover(self, start: int, end: int):
+        if start >= end:
+            return
+
+        ranges = []
+
+        for s, e in self.ranges:
+            if e < start or s > end:
+                ranges.append([s, e])
+            else:
+                start, end = min(s, start), max(e, end)
+
+        ranges.append([start, end])
+        ranges.sort()
+
+        self.ranges = ranges
+        self.dirty = True
+
+    def merge(self, rows: list):
+        fresh = Candles.from_rows(rows).data
+        keep = ~np.isin(self.data[0], fresh[0])
+
+        data = np.concatenate([self.data[:, keep], fresh], axis=1)
+
+        self.data = data[:, np.argsort(data[0], kind='stable')]
+        self.dirty = True
+
+    def trim(self, size: int):
+        if self.data.shape[1] <= size:
+            return
+
+        self.data = self.data[:, -size:]
+
+        first = int(self.data[0, 0])
+
+        self.ranges = [[max(s, first), e] for s, e in self.ranges if e > first]
+
+    def slice(self, start: int, end: int, limit: int, tail: bool) -> Candles:
+        i = np.searchsorted(self.data[0], start, 'left')
+        j = np.searchsorted(self.data[0], end, 'left')
+
+        if j - i > limit:
+            i, j = (j - limit, j) if tail else (i, i + limit)
+
+        return Candles(self.data[:, i:j])
+
+
+class CandleStore(object):
+    series = {}
+
+    @staticmethod
+    def limit() -> int:
+        return int(environ.get('CCXT_CANDLES_LIMIT', 500))
+
+    @staticmethod
+    def directory() -> str:
+        return environ.get('CCXT_CANDLES_DIR')
+
+    @classmethod
+    def get(cls, name: str, symbol: str, timeframe: str, size: int) -> CandleSeries:
+        key = (name, symbol, timeframe)
+
+        if key not in cls.series:
+            cls.series[key] = cls._restore(key, size) or CandleSeries(size)
+
+        return cls.series[key]
+
+    @classmethod
+    async def fetch(cls, exchange: Exchange, symbol: str, timeframe: str, since: int = None, limit: int = None) -> Candles:
+        size = exchange.parse_timeframe(timeframe) * 1000
+        series = cls.get(exchange.id, symbol, timeframe, size)
+
+        now = exchange.milliseconds()
+        current = now - now % size
+        limit = limit or cls.limit()
+
+        if since is None:
+            start, end, tail = current - (limit - 1) * size, current + size, True
+        else:
+            start = since + (-since) % size
+            end, tail = min(start + limit * size, current + size), False
+
+        async with series.lock:
+            # Closed candles never change, only the forming one needs refreshing
+            gaps = series.missing(start, min(end, current))
+
+            if end > current and not cls._fresh(series, current):
+                if gaps and gaps[-1][1] == current:
+                    gaps[-1] = (gaps[-1][0], end)
+                else:
+                    gaps.append((current, end))
+
+            for s, e in gaps:
+                await cls._download(exchange, series, symbol, timeframe, s, e, current)
+
+            series.trim(int(environ.get('CCXT_CANDLES_MAX', 100000)))
+
+            return series.slice(start, end, limit, tail)
+
+    @classmethod
+    def save(cls):
+        directory = cls.directory()
+
+        if not directory:
+            return
+
+        for key, series in cls.series.items():
+            if not series.dirty:
+                continue
+
+            filename = cls._filename(directory, key)
+            makedirs(path.dirname(filename), exist_ok=True)
+
+            np.savez(filename, data=series.data, ranges=np.array(series.ranges, dtype=np.int64).reshape(-1, 2))
+            series.dirty = False
+
+    @classmethod
+    def _restore(cls, key: tuple, size: int) -> CandleSeries:
+        directory = cls.directory()
+
+        if not directory or not path.exists(cls._filename(directory, key)):
+            return None
+
+        with np.load(cls._filename(directory, key)) as stored:
+            return CandleSeries(size, stored['data'], stored['ranges'].tolist())
+
+    @staticmethod
+    def _filename(directory: str, key: tuple) -> str:
+        name, symbol, timeframe = key
+
+        return path.join(directory, name, symbol.replace('/', '-'), timeframe + '.npz')
+
+    @staticmethod
+    def _fresh(series: CandleSeries, current: int) -> bool:
+        ttl = float(environ.get('CCXT_CANDLES_TTL', 1000))
+        candle, fetched = series.forming
+
+        return candle == current and (monotonic() - fetched) * 1000 < ttl
+
+    @staticmethod
+    async def _download(exchange: Exchange, series: CandleSeries, symbol: str, timeframe: str, start: int, end: int, current: int):
+        size = series.timeframe
+        batch = int(environ.get('CCXT_CANDLES_BATCH', 1000))
+        since = start
+
+        while since < end:
+            count = min(-(-(end - since) // size), batch)
+            rows = await exchange.fetch_ohlcv(symbol, timeframe, since, count)
+            rows = [row for row in rows if start <= row[0] < end]
+
+            if not rows or rows[-1][0] + size <= since:
+                break
+
+            series.merge(rows)
+            since = rows[-1][0] + size
+
+        # Only what the venue actually returned is known, the rest stays a gap and is fetched again
+        series.cover(start, min(since, current))
+
+        if end > current:
+            series.forming = (current, monotonic())
+
@@ -1,29 +1,61 @@
-from datetime import datetime
-from collections import defaultdict
+import asyncio
+
+from os import environ
+from typing import Tuple
 
 from ccxt import RequestTimeout, OrderNotFound, InvalidOrder
 from ccxt.async_support.base.exchange import Exchange
 
+from domain.breaker import CircuitBreaker, timeout
+from domain.candles import CandleStore
 from domain.limits import Limits
+from domain.markets import MarketsCache, MarketsEntry
+from domain.orderbook import LocalBook
+from domain.orders import OrderIndex
+from domain.ratelimit import RateLimiter
+from domain.retry import RetryPolicy
 from domain.models import *
 from domain.errors import InvalidSymbol, InvalidOperation, MinOrderAmount
 
 
 class CCXTProxy(ExchangeProxy):
     exchange: Exchange
-    retries: {}
+    retry: RetryPolicy
+    breaker: CircuitBreaker
     limits: Limits
+    seeded: MarketsEntry
+    limiter: RateLimiter
 
     def __init__(self, name: str, exchange: Exchange, limits: Limits):
         super().__init__(name)
 
         self.exchange = exchange
-        self.retries = defaultdict(int)
+        self.retry = RetryPolicy()
         self.limits = limits
+        self.seeded = None
+
+        # Route every load_markets() call, including ccxt's internal ones, through the shared cache
+        self.exchange.load_markets = self._load_markets
+
+        # Throttle through the buckets shared by all workers instead of ccxt's per-instance history
+        self.limiter = RateLimiter(exchange.id, exchange.apiKey, exchange.rateLimit)
+        self.exchange.enableRateLimit = True
+        self.exchange.throttle = self.limiter.throttle
+
+        # Every HTTP request, including market and candle downloads, reports to the venue's breaker
+        self.breaker = CircuitBreaker.get(exchange.id)
+        self.transport = self.exchange.fetch
+        self.exchange.fetch = self._fetch
 
     def features(self) -> Dict:
         return self.exchange.has
 
+    def concurrency(self) -> int:
+        limit = int(environ.get('CCXT_BATCH_CONCURRENCY', 10))
+
+        # rateLimit is the venue's minimum delay between requests in milliseconds
+        return max(1, min(limit, int(1000 / max(self.exchange.rateLimit or 1, 1))))
+
     async def symbols(self) -> List[str]:
         await self.markets()
 
@@ -39,43 +71,43 @@ class CCXTProxy(ExchangeProxy):
     async def markets(self):
         self._guard("fetchMarkets")
 
-        await self.exchange.load_markets()
-
-        return self.exchange.markets
+        return await self.exchange.load_markets()
 
     async def market(self, symbol: Symbol):
         await self.markets()
 
-        if symbol not in self.exchange.markets:
+        if str(symbol) not in self.exchange.markets:
             raise InvalidSymbol(symbol)
 
-        return self.exchange.markets[symbol]
+        return self.exchange.markets[str(symbol)]
 
-    async def tickers(self):
+    async def tickers(self, symbols: List[Symbol] = None):
         self._guard("fetchTickers")
 
-        return await self.exchange.fetch_tickers()
+        tickers = await self._call('fetch_tickers', [str(s) for s in symbols] if symbols else None)
+
+        return {key: Ticker.map(ticker) for key, ticker in tickers.items()}
 
     async def ticker(self, symbol: Symbol):
         self._guard("fetchTicker")
 
-        return await self.exchange.fetch_ticker(str(symbol))
+        return Ticker.map(await self._call('fetch_ticker', str(symbol)))
 
-    async def ohlcv(self, symbol: Symbol, timeframe: str = '1m', since: int = None, limit: int = None) -> List[dict]:
-        self._guard("fetchOHLCV")
+    def timeframe(self, timeframe: str) -> str:
+        """The timeframe ohlcv() actually serves, unsupported ones fall back to the venue's first"""
+        if not getattr(self.exchange, 'timeframes', None):
+            return '1m'
 
-        if not hasattr(self.exchange, 'timeframes'):
-            timeframe = '1m'
-        else:
-            if timeframe not in self.exchange.timeframes:
-                timeframe = list(self.exchange.timeframes.keys())[0]
+        return timeframe if timeframe in self.exchange.timeframes else list(self.exchange.timeframes.keys())[0]
 
+    async def ohlcv(self, symbol: Symbol, timeframe: str = '1m', since: int = None, limit: int = None) -> Candles:
+        self._guard("fetchOHLCV")
+
+        timeframe = self.timeframe(timeframe)
         since = int(since) if since else None
         limit = int(limit) if limit else None
 
-        ohlcv = await self.exchange.fetch_ohlcv(str(symbol), timeframe, since, limit)
-
-        return [OHLCV.map(v) for v in ohlcv]
+        return await CandleStore.fetch(self.exchange, str(symbol), timeframe, since, limit)
 
     async def trades(self, symbol: Symbol, since: int = None, limit: int = None):
         self._guard("fetchTrades")
@@ -83,23 +115,22 @@ class CCXTProxy(ExchangeProxy):
         since = int(since) if since else None
         limit = int(limit) if limit else None
 
-        return await self.exchange.fetch_trades(str(symbol), since, limit)
+        return [TradeItem.map(trade) for trade in await self._call('fetch_trades', str(symbol), since, limit)]
 
     async def book(self, symbol: Symbol, limit: int = None):
+        return (await self.depth(symbol, limit)).book()
+
+    async def depth(self, symbol: Symbol, limit: int = None) -> LocalBook:
         self._guard("fetchOrderBook")
 
         limit = int(limit) if limit else None
-        items = await self.exchange.fetch_order_book(str(symbol), limit)
 
-        bids = [Offer.map(v) for v in items['bids']]
-        asks = [Offer.map(v) for v in items['asks']]
-
-        return OrderBook(bids, asks)
+        return LocalBook.parse(await self._call('fetch_order_book', str(symbol), limit))
 
     async def wallet(self) -> Wallet:
         self._guard("fetchBalance")
 
-        balances = await self.exchange.fetch_balance()
+        balances = await self._call('fetch_balance')
 
         return Wallet(balances['free'], balances['used'], balances['total'])
 
@@ -107,7 +138,7 @@ class CCXTProxy(ExchangeProxy):
         self._guard("fetchBalance")
 
         currency = base.upper()
-        balances = await self.exchange.fetch_balance()
+        balances = await self._call('fetch_balance')
 
         return Balance(balances[currency] if currency in balances else {})
 
@@ -118,77 +149,158 @@ class CCXTProxy(ExchangeProxy):
         if status == 'open':
             self._guard("fetchOpenOrders")
 
-            return await self.exchange.fetch_open_orders(str(symbol), since, limit)
+            orders = await self._call('fetch_open_orders', str(symbol), since, limit)
         elif status == 'closed':
             self._guard("fetchClosedOrders")
 
-            return await self.exchange.fetch_closed_orders(str(symbol), since, limit)
+            orders = await self._call('fetch_closed_orders', str(symbol), since, limit)
         else:
             self._guard("fetchOrders")
 
-            return await self.exchange.fetch_orders(str(symbol), since, limit)
+            orders = await self._call('fetch_orders', str(symbol), since, limit)
+
+        return [Order.map(order) for order in orders]
 
     async def get_order(self, symbol: Symbol, _id: str):
         self._guard("fetchOrder")
 
-        return await self.exchange.fetch_order(_id, str(symbol))
+        return Order.map(await self._call('fetch_order', _id, str(symbol)))
 
-    async def create_order(self, symbol: Symbol, type: str, side: str, amount: float, price: float = None):
+    async def create_order(self, symbol: Symbol, type: str, side: str, amount: float, price: float = None, client_id: str = None):
         self._guard("createOrder")
 
-        time = int(datetime.utcnow().timestamp())
+        amount, price = self._validate(await self.market(symbol), amount, price)
 
-        try:
-            order = await self.exchange.create_order(str(symbol), type, side, amount, price)
+        if client_id is None:
+            return await self._create_order(symbol, type, side, amount, price)
+
+        key = OrderIndex.key(self.exchange.id, self.exchange.apiKey, client_id)
+
+        return await OrderIndex.place(key, lambda: self._create_order(symbol, type, side, amount, price, client_id))
+
+    async def _create_order(self, symbol: Symbol, type: str, side: str, amount: float, price: float = None, client_id: str = None):
+        since = self.exchange.milliseconds()
+
+        # Elsewhere the id only deduplicates through the local index
+        if client_id is not None and not OrderIndex.forwards(self.exchange.id):
+            client_id = None
 
-            return order
+        params = {'clientOrderId': client_id} if client_id else {}
+
+        try:
+            return Order.map(await self.exchange.create_order(str(symbol), type, side, amount, price, params))
         except RequestTimeout as error:
-            # TODO !!!
-            if 'fetchOpenOrders' in self.exchange.has:
-                orders = await self.exchange.fetch_open_orders(str(symbol), time)
+            # The order may still have reached the venue, look for it before reporting a failure
+            order = await self._reconcile(symbol, type, side, amount, since, client_id)
 
-                for order in orders:
-                    if order.side == side and order.type == type and order.amount == amount:
-                        return order
+            if order is None:
+                raise error
 
-            raise error
+            return Order.map(order)
         except InvalidOrder as error:
             limit = self.limits.fetch(self.exchange)
 
-            if limit >= amount * price:
+            if price is not None and limit >= amount * price:
                 raise MinOrderAmount(str(error))
 
             raise error
 
+    async def _reconcile(self, symbol: Symbol, type: str, side: str, amount: float, since: int, client_id: str = None):
+        if self.exchange.has.get('fetchOrders'):
+            orders = await self._call('fetch_orders', str(symbol), since)
+        elif self.exchange.has.get('fetchOpenOrders'):
+            orders = await self._call('fetch_open_orders', str(symbol), since)
+        else:
+            return None
+
+        if client_id is not None:
+            matches = [o for o in orders if o.get('clientOrderId') == client_id]
+        else:
+            matches = [o for o in orders if o.get('side') == side and o.get('type') == type and o.get('amount') == amount]
+
+        # Without a client id several identical orders are indistinguishable, better fail than pick the wrong one
+        return matches[0] if len(matches) == 1 else None
+
     async def cancel_order(self, symbol: Symbol, _id: str):
         self._guard("cancelOrder")
 
-        try:
-            await self.exchange.cancel_order(_id, str(symbol))
-        except OrderNotFound as error:
-            if self.retries[_id] > 0:
-                # Update Order Cache
-                if 'fetchOrder' in self.exchange.has:
-                    await self.exchange.fetch_order(_id, str(symbol))
-
-                self.retries[_id] = 0
+        attempts = []
 
-                return
+        async def cancel():
+            attempts.append(_id)
 
-            raise error
-        except RequestTimeout as error:
-            self.retries[_id] += 1
+            return await self.exchange.cancel_order(_id, str(symbol))
 
-            if self.retries[_id] > 5:
-                self.retries[_id] = 0
+        try:
+            await self.retry.run(self.exchange.id, cancel)
+        except OrderNotFound:
+            # An attempt that timed out may still have cancelled the order
+            if len(attempts) > 1:
+                return
 
-                raise error
-            else:
-                self.cancel_order(symbol, _id)
+            raise
 
     async def close(self):
         return await self.exchange.close()
 
+    async def _load_markets(self, reload: bool = False, params: dict = None):
+        if reload:
+            MarketsCache.invalidate(self.exchange.id)
+
+        entry = await MarketsCache.load(self.exchange)
+
+        if self.seeded is not entry:
+            self.exchange.set_markets(entry.markets, entry.currencies)
+            self.seeded = entry
+
+        return self.exchange.markets
+
+    async def _call(self, method: str, *args):
+        seconds = timeout(self.exchange.id, method) / 1000
+
+        async def attempt():
+            try:
+                return await asyncio.wait_for(getattr(self.exchange, method)(*args), seconds)
+            except asyncio.TimeoutError:
+                # The breaker only saw its request cancelled, a venue that hangs must still count as failing
+                self.breaker.record(True, seconds)
+
+                raise RequestTimeout('%s %s timed out after %.0f ms' % (self.exchange.id, method, seconds * 1000))
+
+        return await self.retry.run(self.exchange.id, attempt)
+
+    async def _fetch(self, *args, **kwargs):
+        return await self.breaker.call(lambda: self.transport(*args, **kwargs))
+
+    def _validate(self, market: dict, amount: float, price: float = None) -> Tuple[float, float]:
+        precision = market.get('precision') or {}
+        limits = market.get('limits') or {}
+        symbol = market['symbol']
+
+        # Round the way the venue would, so the checks below see the amount that would actually be sent
+        try:
+            if precision.get('amount') is not None:
+                amount = float(self.exchange.amount_to_precision(symbol, amount))
+            if price is not None and precision.get('price') is not None:
+                price = float(self.exchange.price_to_precision(symbol, price))
+        except InvalidOrder as error:
+            raise MinOrderAmount(str(error))
+
+        minimum = (limits.get('amount') or {}).get('min')
+
+        if amount <= 0 or (minimum is not None and amount < minimum):
+            raise MinOrderAmount('%s amount %s is below the minimum of %s' % (symbol, amount, minimum or 0))
+
+        # Market orders carry no price, their cost can only be checked by the venue
+        if price is not None:
+            cost = amount * price
+            minimum = max((limits.get('cost') or {}).get('min') or 0, self.limits.fetch(self.exchange))
+
+            if cost < minimum:
+                raise MinOrderAmount('%s cost %s is below the minimum of %s' % (symbol, cost, minimum))
+
+        return amount, price
+
     def _guard(self, ability: str):
         if not self.exchange.has[ability]:
             raise InvalidOperation(ability)
@@ -15,8 +15,8 @@ class CrypstyxSecurity:
     _nonce: int
 
     def __init__(self, params: dict):
-        self._key = params['apiKey']
-        self._secret = params['secret']
+        self._key = params.get('apiKey')
+        self._secret = params.get('secret')
         self._nonce = 0
 
     def header(self, method: str, url: str, data=''):
@@ -53,7 +53,7 @@ class CrypstyxProxy(ExchangeProxy):
         super().__init__('crypstyx')
 
         self._security = CrypstyxSecurity(params)
-        self.features = {
+        self._features = {
             "fetchCurrencies": True,
             "fetchMarkets": False,
             "fetchOHLCV": True,
@@ -104,15 +104,16 @@ class CrypstyxProxy(ExchangeProxy):
     async def ticker(self, symbol: Symbol):
         pass
 
-    async def ohlcv(self, symbol: Symbol, timeframe: str = '1m', since: int = None, limit: int = None) -> List[dict]:
+    def timeframe(self, timeframe: str) -> str:
+        return timeframe if timeframe in self._timeframes else list(self._timeframes.keys())[0]
+
+    async def ohlcv(self, symbol: Symbol, timeframe: str = '1m', since: int = None, limit: int = None) -> Candles:
         await self.__load()
 
         if str(symbol) not in self._symbols:
             raise InvalidSymbol(symbol)
 
-        if timeframe not in self._timeframes:
-            timeframe = list(self._timeframes.keys())[0]
-
+        timeframe = self.timeframe(timeframe)
         limit = int(limit) if limit else 100
         now = datetime.utcnow()
 
@@ -128,7 +129,6 @@ class CrypstyxProxy(ExchangeProxy):
             "Content-Type": "application/json"
         }
 
-        k = ['t', 'o', 'h', 'l', 'c', 'v']
         ohlcv = []
 
         async with aiohttp.ClientSession() as session:
@@ -138,16 +138,16 @@ class CrypstyxProxy(ExchangeProxy):
                 for item in payload:
                     _time = datetime.strptime(item['dateTime'], "%Y-%m-%dT%H:%M:%S")
 
-                    ohlcv.append(dict(zip(k, [
+                    ohlcv.append([
                         int(_time.timestamp() * 1000),
                         item['open'],
                         item['high'],
                         item['low'],
                         item['close'],
                         item['volume'],
-                    ])))
+                    ])
 
-        return ohlcv
+        return Candles.from_rows(ohlcv)
 
     async def trades(self, symbol: Symbol, since: int = None, limit: int = None):
         pass
@@ -172,7 +172,7 @@ class CrypstyxProxy(ExchangeProxy):
     async def get_order(self, symbol: Symbol, _id: str):
         pass
 
-    async def create_order(self, symbol: Symbol, type: str, side: str, amount: float, price: float = None):
+    async def create_order(self, symbol: Symbol, type: str, side: str, amount: float, price: float = None, client_id: str = None):
         pass
 
     async def cancel_order(self, symbol: Symbol, _id: str):
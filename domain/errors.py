@@ -16,3 +16,16 @@ class InvalidOperation(DomainError):
 
 class MinOrderAmount(DomainError):
     pass
+
+
+class InvalidIndicator(DomainError):
+    pass
+
+
+class ExchangeUnavailable(DomainError):
+    retry_after: float
+
+    def __init__(self, message: str, retry_after: float = None):
+        super().__init__(message)
+
+        self.retry_after = retry_after
@@ -1,29 +1,35 @@
+import asyncio
 import ccxt.async_support as ccxt
 
+from os import environ
+from typing import Dict
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+from domain.breaker import timeout
 from domain.errors import InvalidExchange
 from domain.crypstyx import CrypstyxProxy
 from domain.ccxt import CCXTProxy
 from domain.limits import LimitsSource
+from domain.pool import ExchangePool
 
 
 class ExchangeFactory(object):
-    limits = None
+    pool = None
+    exchanges = None
 
     @staticmethod
-    async def list():
-        exchanges = ['crypstyx'] + ccxt.exchanges
-
-        for key in exchanges:
-            exchange = await ExchangeFactory.load(key)
+    def features() -> asyncio.Future:
+        if ExchangeFactory.exchanges is None:
+            ExchangeFactory.exchanges = asyncio.ensure_future(ExchangeFactory._features())
+            ExchangeFactory.exchanges.add_done_callback(ExchangeFactory._features_done)
 
-            yield key, exchange
-
-            await exchange.close()
+        return ExchangeFactory.exchanges
 
     @staticmethod
     async def load(name: str, params: dict = None):
         params = params or {}
-        params['timeout'] = 30000
+        params['timeout'] = timeout(name)
 
         if name == 'crypstyx':
             return CrypstyxProxy(params)
@@ -31,7 +37,46 @@ class ExchangeFactory(object):
         if not hasattr(ccxt, name):
             raise InvalidExchange(name)
 
-        if ExchangeFactory.limits is None:
-            ExchangeFactory.limits = await LimitsSource.load()
+        return CCXTProxy(name, getattr(ccxt, name)(params), LimitsSource.limits)
+
+    @staticmethod
+    @asynccontextmanager
+    async def acquire(name: str, params: dict = None):
+        if ExchangeFactory.pool is None:
+            ExchangeFactory.pool = ExchangePool()
+
+        params = dict(params or {})
+        key = (name, ExchangePool.fingerprint(params))
+
+        exchange = await ExchangeFactory.pool.acquire(key, lambda: ExchangeFactory.load(name, params))
+
+        try:
+            yield exchange
+        finally:
+            ExchangeFactory.pool.release(key)
 
-        return CCXTProxy(name, getattr(ccxt, name)(params), ExchangeFactory.limits)
+    @staticmethod
+    async def _features() -> Dict[str, dict]:
+        loop = asyncio.get_event_loop()
+        workers = int(environ.get('CCXT_FEATURES_WORKERS', 1))
+
+        # `has` only depends on the exchange class, no session is ever opened here
+        with ThreadPoolExecutor(workers) as executor:
+            values = await asyncio.gather(*[
+                loop.run_in_executor(executor, lambda key: getattr(ccxt, key)().has, key) for key in ccxt.exchanges
+            ])
+
+        exchanges = {'crypstyx': CrypstyxProxy({}).features()}
+        exchanges.update(zip(ccxt.exchanges, values))
+
+        return exchanges
+
+    @staticmethod
+    def _features_done(future: asyncio.Future):
+        if future.cancelled() or future.exception() is not None:
+            ExchangeFactory.exchanges = None
+
+    @staticmethod
+    async def close():
+        if ExchangeFactory.pool is not None:
+            await ExchangeFactory.pool.close()
@@ -0,0 +1,375 @@
+import copy
+import math
+import talib as ta
+import numpy as np
+
+from time import time
+from talib import abstract
+from collections import deque, OrderedDict
+from typing import Dict, List, Tuple
+
+from domain.errors import InvalidIndicator
+from domain.models import Candles
+
+
+class EMA(object):
+    period: int
+    alpha: float
+    value: float
+
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.value = None
+
+    def seed(self, values) -> float:
+        self.value = sum(values) / self.period
+
+        return self.value
+
+    def update(self, x: float) -> float:
+        self.value = (x - self.value) * self.alpha + self.value
+
+        return self.value
+
+
+class MACD(object):
+    """Incremental MACD matching TA-Lib's seeding of the fast, slow and signal averages"""
+
+    def __init__(self, fast: int, slow: int, signal: int):
+        if slow < fast:
+            fast, slow = slow, fast
+
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+        self.closes = deque(maxlen=slow)
+        self.values = []
+
+    def update(self, x: float) -> Tuple[float, float, float]:
+        if self.slow.value is None:
+            self.closes.append(x)
+
+            if len(self.closes) < self.slow.period:
+                return math.nan, math.nan, math.nan
+
+            # TA-Lib seeds both averages on the same bar, the fast one from its own trailing window
+            self.slow.seed(self.closes)
+            self.fast.seed(list(self.closes)[-self.fast.period:])
+            self.closes.clear()
+        else:
+            self.fast.update(x)
+            self.slow.update(x)
+
+        macd = self.fast.value - self.slow.value
+
+        if self.signal.value is None:
+            self.values.append(macd)
+
+            if len(self.values) < self.signal.period:
+                return math.nan, math.nan, math.nan
+
+            self.signal.seed(self.values)
+            self.values = []
+        else:
+            self.signal.update(macd)
+
+        return macd, self.signal.value, macd - self.signal.value
+
+
+class RSI(object):
+    """Incremental RSI with Wilder smoothing, seeded like TA-Lib from plain averages"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.previous = None
+        self.gain = 0.0
+        self.loss = 0.0
+        self.count = 0
+
+    def update(self, x: float) -> float:
+        if self.previous is None:
+            self.previous = x
+
+            return math.nan
+
+        diff, self.previous = x - self.previous, x
+        gain, loss = max(diff, 0.0), max(-diff, 0.0)
+
+        self.count += 1
+
+        if self.count <= self.period:
+            self.gain += gain / self.period
+            self.loss += loss / self.period
+
+            if self.count < self.period:
+                return math.nan
+        else:
+            self.gain = (self.gain * (self.period - 1) + gain) / self.period
+            self.loss = (self.loss * (self.period - 1) + loss) / self.period
+
+        total = self.gain + self.loss
+
+        return 100.0 * self.gain / total if total != 0 else 0.0
+
+
+class OBV(object):
+    def __init__(self):
+        self.previous = None
+        self.value = 0.0
+
+    def update(self, close: float, volume: float) -> float:
+        if self.previous is None:
+            self.value = volume
+        elif close > self.previous:
+            self.value += volume
+        elif close < self.previous:
+            self.value -= volume
+
+        self.previous = close
+
+        return self.value
+
+
+class IndicatorState(object):
+    HISTORY = 10000
+
+    last: int
+    verified: bool
+    values: Dict[str, float]
+    baselines: OrderedDict
+
+    def __init__(self, fast: int, slow: int, signal: int):
+        self.macd = MACD(fast, slow, signal)
+        self.rsi = RSI(14)
+        self.rsf = RSI(5)
+        self.obv = OBV()
+        self.last = None
+        self.verified = False
+        self.values = {}
+        self.baselines = OrderedDict()
+
+    def update(self, t: int, close: float, volume: float) -> Dict[str, float]:
+        macd, sig, hist = self.macd.update(close)
+
+        self.last = t
+        self.values = {
+            'hist': hist,
+            'macd': macd,
+            'sig': sig,
+            'rsi': self.rsi.update(close),
+            'rsf': self.rsf.update(close),
+            'obv': self.obv.update(close, volume),
+        }
+
+        self.baselines[t] = self.obv.value - volume
+
+        if len(self.baselines) > self.HISTORY:
+            self.baselines.popitem(last=False)
+
+        return self.values
+
+    def peek(self, t: int, close: float, volume: float) -> Dict[str, float]:
+        state = copy.copy(self)
+        state.macd = copy.deepcopy(self.macd)
+        state.rsi = copy.copy(self.rsi)
+        state.rsf = copy.copy(self.rsf)
+        state.obv = copy.copy(self.obv)
+        state.baselines = {}
+
+        return state.update(t, close, volume)
+
+    def window(self, values: Dict[str, float], t: int) -> Dict[str, float]:
+        # OBV is cumulative, rebase it on the first candle of the requested window like TA-Lib does
+        return dict(values, obv=values['obv'] - self.baselines[t])
+
+
+class IndicatorEngine(object):
+    TOLERANCE = 1e-6
+    SIZE = 1024
+
+    states = OrderedDict()
+
+    @classmethod
+    def compute(cls, key: tuple, candles: Candles, timeframe: int, fast: int, slow: int, signal: int) -> Dict[str, float]:
+        key = key + (fast, slow, signal)
+
+        if len(candles) == 0:
+            return cls.talib(candles, fast, slow, signal)
+
+        # Only closed candles are folded into the running state, the forming one is peeked
+        closed = int(np.searchsorted(candles.t + timeframe, time() * 1000, 'right'))
+        state = cls.states.get(key)
+
+        if state is not None:
+            start = int(np.searchsorted(candles.t, state.last)) if state.last is not None else len(candles)
+
+            if start >= closed or candles.t[start] != state.last or int(candles.t[0]) not in state.baselines:
+                state = None
+
+        if state is None:
+            state = cls._seed(candles, closed, fast, slow, signal)
+            cls.states[key] = state
+
+            # Periods come from the client, so the number of states is bounded like the batch results
+            if len(cls.states) > cls.SIZE:
+                cls.states.popitem(last=False)
+        else:
+            cls.states.move_to_end(key)
+
+            for i in range(start + 1, closed):
+                state.update(int(candles.t[i]), candles.c[i], candles.v[i])
+
+        if not state.verified:
+            return cls.talib(candles, fast, slow, signal)
+
+        if closed < len(candles):
+            return state.window(state.peek(int(candles.t[-1]), candles.c[-1], candles.v[-1]), int(candles.t[0]))
+
+        return state.window(state.values, int(candles.t[0]))
+
+    @staticmethod
+    def talib(candles: Candles, fast: int, slow: int, signal: int) -> Dict[str, float]:
+        try:
+            macd, sig, hist = ta.MACD(candles.c, fastperiod=fast, slowperiod=slow, signalperiod=signal)
+        except Exception as error:
+            raise InvalidIndicator('macd:%d,%d,%d: %s' % (fast, slow, signal, error))
+
+        obv = ta.OBV(candles.c, candles.v)
+
+        rsi = ta.RSI(candles.c, timeperiod=14)
+        rsf = ta.RSI(candles.c, timeperiod=5)
+
+        return {
+            'hist': hist[-1] if len(hist) else math.nan,
+            'macd': macd[-1] if len(macd) else math.nan,
+            'sig': sig[-1] if len(sig) else math.nan,
+            'rsi': rsi[-1] if len(rsi) else math.nan,
+            'rsf': rsf[-1] if len(rsf) else math.nan,
+            'obv': obv[-1] if len(obv) else math.nan,
+        }
+
+    @classmethod
+    def _seed(cls, candles: Candles, closed: int, fast: int, slow: int, signal: int) -> IndicatorState:
+        state = IndicatorState(fast, slow, signal)
+
+        if closed == 0:
+            return state
+
+        for i in range(closed):
+            state.update(int(candles.t[i]), candles.c[i], candles.v[i])
+
+        expected = cls.talib(Candles(candles.data[:, :closed]), fast, slow, signal)
+        state.verified = all(cls._close(state.values[k], v) for k, v in expected.items())
+
+        return state
+
+    @classmethod
+    def _close(cls, a: float, b: float) -> bool:
+        if math.isnan(a) or math.isnan(b):
+            return math.isnan(a) and math.isnan(b)
+
+        return abs(a - b) <= cls.TOLERANCE * max(1.0, abs(b))
+
+
+class IndicatorSpec(object):
+    INPUTS = {'open', 'high', 'low', 'close', 'volume'}
+
+    key: str
+    name: str
+    params: Dict[str, float]
+    outputs: List[str]
+
+    def __init__(self, key: str, name: str, params: Dict[str, float], outputs: List[str]):
+        self.key = key
+        self.name = name
+        self.params = params
+        self.outputs = outputs
+
+    @staticmethod
+    def parse(value: str) -> 'IndicatorSpec':
+        name, _, args = value.partition(':')
+
+        try:
+            function = abstract.Function(name.upper())
+        except Exception:
+            raise InvalidIndicator(name)
+
+        # Only the candle columns can be fed in, functions such as MAVP need series of their own
+        for series in function.input_names.values():
+            if not IndicatorSpec.INPUTS.issuperset([series] if isinstance(series, str) else series):
+                raise InvalidIndicator(name)
+
+        names = list(function.parameters.keys())
+        params = {}
+
+        for i, arg in enumerate(a for a in args.split(',') if a):
+            key, _, number = arg.rpartition('=')
+            key = key or (names[i] if i < len(names) else None)
+
+            if key not in names:
+                raise InvalidIndicator(value)
+
+            try:
+                params[key] = int(number) if number.lstrip('-').isdigit() else float(number)
+            except ValueError:
+                raise InvalidIndicator(value)
+
+        return IndicatorSpec(value, name.upper(), params, list(function.output_names))
+
+
+class IndicatorBatch(object):
+    SIZE = 1024
+
+    results = OrderedDict()
+
+    @classmethod
+    def compute(cls, key: tuple, candles: Candles, specs: List[IndicatorSpec], full: bool = False) -> Dict[str, dict]:
+        if len(candles) == 0:
+            return {spec.key: {name: [] if full else None for name in spec.outputs} for spec in specs}
+
+        # The last candle fully identifies the series in the store, so results are reused until it changes
+        tail = tuple(candles.data[:, -1].tolist()) + (int(candles.t[0]), len(candles), full)
+        inputs = {
+            'open': candles.o,
+            'high': candles.h,
+            'low': candles.l,
+            'close': candles.c,
+            'volume': candles.v,
+        }
+        values = {}
+
+        for spec in specs:
+            memo = key + tail + (spec.name, tuple(sorted(spec.params.items())))
+
+            if memo not in cls.results:
+                cls.results[memo] = cls._compute(spec, inputs, full)
+
+                if len(cls.results) > cls.SIZE:
+                    cls.results.popitem(last=False)
+
+            values[spec.key] = cls.results[memo]
+
+        return values
+
+    @staticmethod
+    def _compute(spec: IndicatorSpec, inputs: Dict[str, np.ndarray], full: bool) -> Dict[str, object]:
+        try:
+            outputs = abstract.Function(spec.name)(inputs, **spec.params)
+        except Exception as error:
+            # TA-Lib reports out of range parameters as a bare Exception
+            raise InvalidIndicator('%s: %s' % (spec.key, error))
+
+        if len(spec.outputs) == 1:
+            outputs = [outputs]
+
+        values = {}
+
+        for name, output in zip(spec.outputs, outputs):
+            output = np.asarray(output, dtype=float)
+            items = output.tolist() if full else output[-1:].tolist()
+            items = [None if x != x else x for x in items]
+
+            values[name] = items if full else items[0]
+
+        return values
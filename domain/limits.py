@@ -1,53 +1,145 @@
 import asyncio
+import logging
+import sqlite3
 import aiomysql
 
 from os import environ
-from collections import defaultdict
+from time import time, monotonic
 from urllib.parse import urlparse
 from ccxt import Exchange
 
+logger = logging.getLogger(__name__)
+
 
 class Limits(object):
-    values: defaultdict(float)
+    values: dict
 
     def __init__(self, values: dict = None):
-        self.values = defaultdict(float)
-        self.values.update(values or {})
+        self.values = dict(values or {})
 
     def fetch(self, exchange: Exchange) -> float:
-        return self.values[exchange.id]
+        return self.values.get(exchange.id, 0.0)
+
+    def swap(self, values: dict):
+        # A single assignment, so readers see either the old table or the new one
+        self.values = values
 
 
 class LimitsSource(object):
+    QUERY = "SELECT Exchange, MinOrderAmount FROM ExchangeSettings"
+
+    # Shared with every CCXTProxy, refreshes swap its contents in place
+    limits = Limits()
+    pool = None
+    task = None
+    stats = {
+        'loads': 0,
+        'failures': 0,
+        'changes': 0,
+        'size': 0,
+        'duration': None,
+        'loaded': None,
+        'error': None,
+    }
+
+    @staticmethod
+    def dsn():
+        return environ.get('CCXT_LIMITS_DSN')
+
+    @staticmethod
+    def interval() -> float:
+        return float(environ.get('CCXT_LIMITS_REFRESH', 60))
+
     @classmethod
-    async def load(cls) -> Limits:
-        values = {}
+    def start(cls):
+        if cls.task is None and cls.dsn():
+            cls.task = asyncio.ensure_future(cls._run())
+
+    @classmethod
+    async def stop(cls):
+        if cls.task is not None:
+            cls.task.cancel()
+            cls.task = None
+
+        if cls.pool is not None:
+            cls.pool.close()
+            await cls.pool.wait_closed()
+            cls.pool = None
+
+    @classmethod
+    async def refresh(cls) -> bool:
+        started = monotonic()
 
         try:
-            dsn = environ.get('CCXT_LIMITS_DSN')
-            parts = urlparse(dsn)
+            values = await cls.load()
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            cls.stats['failures'] += 1
+            cls.stats['error'] = '%s: %s' % (error.__class__.__name__, error)
+
+            logger.exception('Failed to load exchange limits')
+
+            return False
+        finally:
+            cls.stats['duration'] = round((monotonic() - started) * 1000, 3)
 
-            conn = await aiomysql.connect(
+        changed = values != cls.limits.values
+
+        if changed:
+            cls.limits.swap(values)
+            cls.stats['changes'] += 1
+
+        cls.stats.update(loads=cls.stats['loads'] + 1, size=len(values), loaded=time(), error=None)
+
+        return changed
+
+    @classmethod
+    async def load(cls) -> dict:
+        parts = urlparse(cls.dsn())
+
+        if parts.scheme == 'sqlite':
+            rows = await asyncio.get_event_loop().run_in_executor(None, cls._sqlite, parts.path[1:])
+        else:
+            rows = await cls._mysql(parts)
+
+        return {exchange: float(amount) for exchange, amount in rows}
+
+    @classmethod
+    async def _mysql(cls, parts) -> list:
+        if cls.pool is None:
+            cls.pool = await aiomysql.create_pool(
                 host=parts.hostname,
-                port=parts.port,
+                port=parts.port or 3306,
                 user=parts.username,
                 password=parts.password,
                 db=parts.path.strip('/'),
-                loop=asyncio.get_event_loop()
+                minsize=1,
+                maxsize=int(environ.get('CCXT_LIMITS_POOL', 2)),
             )
 
-            async with conn.cursor(aiomysql.DictCursor) as cur:
-                await cur.execute("SELECT Exchange, MinOrderAmount FROM ExchangeSettings")
+        async with cls.pool.acquire() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(cls.QUERY)
 
-                results = await cur.fetchall()
+                return await cur.fetchall()
 
-                for item in results:
-                    values.update({
-                        item['Exchange']: float(item['MinOrderAmount']),
-                    })
+    @classmethod
+    def _sqlite(cls, filename: str) -> list:
+        conn = sqlite3.connect(filename)
 
+        try:
+            return conn.execute(cls.QUERY).fetchall()
+        finally:
             conn.close()
-        except Exception:
-            pass
 
-        return Limits(values)
+    @classmethod
+    async def _run(cls):
+        while True:
+            await cls.refresh()
+
+            # Retry a failed load sooner, an empty table would otherwise stick until the next interval
+            if cls.stats['error'] is None:
+                await asyncio.sleep(cls.interval())
+            else:
+                await asyncio.sleep(min(cls.interval(), float(environ.get('CCXT_LIMITS_RETRY', 5))))
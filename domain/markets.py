@@ -0,0 +1,87 @@
+import asyncio
+
+from os import environ
+from time import monotonic
+
+from ccxt.async_support.base.exchange import Exchange
+
+
+class MarketsEntry(object):
+    markets: dict
+    currencies: dict
+    loaded: float
+
+    def __init__(self, markets: dict, currencies: dict):
+        self.markets = markets
+        self.currencies = currencies
+        self.loaded = monotonic()
+
+    def age(self) -> float:
+        return monotonic() - self.loaded
+
+
+class MarketsCache(object):
+    entries = {}
+    pending = {}
+
+    @staticmethod
+    def ttl() -> float:
+        return float(environ.get('CCXT_MARKETS_TTL', 3600))
+
+    @staticmethod
+    def refresh() -> float:
+        return float(environ.get('CCXT_MARKETS_REFRESH', MarketsCache.ttl() * 0.8))
+
+    @staticmethod
+    def stale() -> float:
+        return float(environ.get('CCXT_MARKETS_STALE', 0))
+
+    @classmethod
+    async def load(cls, exchange: Exchange) -> MarketsEntry:
+        entry = cls.entries.get(exchange.id)
+
+        # Within the stale window the old markets are served while a single refresh runs
+        if entry is None or entry.age() > cls.ttl() + cls.stale():
+            return await asyncio.shield(cls.fetch(exchange))
+
+        if entry.age() > cls.refresh():
+            cls.fetch(exchange)
+
+        return entry
+
+    @classmethod
+    def fetch(cls, exchange: Exchange) -> asyncio.Future:
+        future = cls.pending.get(exchange.id)
+
+        if future is None:
+            future = asyncio.ensure_future(cls._download(exchange))
+            future.add_done_callback(lambda f: cls._done(exchange.id, f))
+
+            cls.pending[exchange.id] = future
+
+        return future
+
+    @classmethod
+    def invalidate(cls, name: str = None):
+        if name is None:
+            cls.entries.clear()
+        else:
+            cls.entries.pop(name, None)
+
+    @classmethod
+    async def _download(cls, exchange: Exchange) -> MarketsEntry:
+        # Bypass the instance level cache hook and hit the venue
+        markets = await type(exchange).load_markets(exchange, True)
+
+        entry = MarketsEntry(markets, exchange.currencies)
+        cls.entries[exchange.id] = entry
+
+        return entry
+
+    @classmethod
+    def _done(cls, name: str, future: asyncio.Future):
+        cls.pending.pop(name, None)
+
+        # Background refreshes have no awaiting request, so consume the error here
+        if not future.cancelled():
+            future.exception()
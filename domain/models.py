@@ -1,7 +1,23 @@
+import numpy as np
+
 from abc import abstractmethod
 from typing import Dict, List
 
 
+class Model:
+    """Slotted value object, compared and encoded field by field"""
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, ', '.join('%s=%r' % (k, getattr(self, k)) for k in self.__slots__))
+
+    def to_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
 class Symbol:
     base: str
     quote: str
@@ -10,11 +26,17 @@ class Symbol:
         self.base = base.upper()
         self.quote = quote.upper()
 
+    @staticmethod
+    def parse(value: str) -> 'Symbol':
+        base, _, quote = str(value).partition('/')
+
+        return Symbol(base, quote)
+
     def __str__(self):
         return '%s/%s' % (self.base, self.quote)
 
     def __hash__(self):
-        return str(self)
+        return hash(str(self))
 
 
 class ExchangeFeatures:
@@ -74,7 +96,11 @@ class Market:
     limits: MarketLimits
 
 
-class Ticker:
+class Ticker(Model):
+    __slots__ = ('symbol', 'timestamp', 'datetime', 'high', 'low', 'bid', 'bidVolume', 'ask', 'askVolume', 'vwap',
+                 'open', 'close', 'last', 'previousClose', 'change', 'percentage', 'average', 'baseVolume',
+                 'quoteVolume', 'indexPrice', 'markPrice')
+
     symbol: str
     timestamp: int
     bid: float
@@ -84,8 +110,19 @@ class Ticker:
     baseVolume: float
     quoteVolume: float
 
+    def __init__(self, **values):
+        for key in self.__slots__:
+            setattr(self, key, values.get(key))
+
+    @staticmethod
+    def map(ticker: dict) -> 'Ticker':
+        # The raw venue payload under 'info' is dropped, it is most of the object's size
+        return Ticker(**ticker)
+
+
+class OHLCV(Model):
+    __slots__ = ('t', 'o', 'h', 'l', 'c', 'v')
 
-class OHLCV:
     t: int
     o: float
     h: float
@@ -93,14 +130,89 @@ class OHLCV:
     c: float
     v: float
 
+    def __init__(self, t: int, o: float, h: float, l: float, c: float, v: float):
+        self.t = t
+        self.o = o
+        self.h = h
+        self.l = l
+        self.c = c
+        self.v = v
+
     @staticmethod
-    def map(v: list) -> dict:
-        k = ['t', 'o', 'h', 'l', 'c', 'v']
+    def map(row: list) -> 'OHLCV':
+        return OHLCV(*row[:6])
+
+
+class Candles:
+    COLUMNS = ('t', 'o', 'h', 'l', 'c', 'v')
+
+    data: np.ndarray
+
+    def __init__(self, data: np.ndarray):
+        self.data = data
+
+    @staticmethod
+    def from_rows(rows: list) -> 'Candles':
+        return Candles(np.array(rows, dtype=float).T.reshape(len(Candles.COLUMNS), -1))
+
+    @property
+    def t(self) -> np.ndarray:
+        return self.data[0]
+
+    @property
+    def o(self) -> np.ndarray:
+        return self.data[1]
+
+    @property
+    def h(self) -> np.ndarray:
+        return self.data[2]
+
+    @property
+    def l(self) -> np.ndarray:
+        return self.data[3]
+
+    @property
+    def c(self) -> np.ndarray:
+        return self.data[4]
+
+    @property
+    def v(self) -> np.ndarray:
+        return self.data[5]
+
+    def __len__(self):
+        return self.data.shape[1]
+
+    def columns(self) -> Dict[str, list]:
+        columns = {'t': self.t.astype(np.int64).tolist()}
 
-        return dict(zip(k, v))
+        for key, values in zip(self.COLUMNS[1:], self.data[1:]):
+            missing = np.isnan(values)
+            columns[key] = values.tolist()
 
+            if missing.any():
+                for i in np.flatnonzero(missing).tolist():
+                    columns[key][i] = None
+
+        return columns
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        columns = {'t': self.t.astype(np.int64)}
+        columns.update(zip(self.COLUMNS[1:], self.data[1:]))
+
+        return columns
+
+    def rows(self) -> List[OHLCV]:
+        return [OHLCV(*values) for values in zip(*self.columns().values())]
+
+    def records(self) -> List[dict]:
+        # Plain dicts straight from the column lists, the encoder takes them without a default() round trip
+        return [{'t': t, 'o': o, 'h': h, 'l': l, 'c': c, 'v': v} for t, o, h, l, c, v in zip(*self.columns().values())]
+
+
+class TradeItem(Model):
+    __slots__ = ('id', 'timestamp', 'datetime', 'symbol', 'order', 'type', 'side', 'takerOrMaker', 'price', 'amount',
+                 'cost', 'fee', 'fees')
 
-class TradeItem:
     id: str
     timestamp: int
     order: str
@@ -108,18 +220,40 @@ class TradeItem:
     side: str
     price: float
     amount: float
+    fee: 'OrderFee'
+
+    def __init__(self, **values):
+        for key in self.__slots__:
+            setattr(self, key, values.get(key))
+
+    @staticmethod
+    def map(trade: dict) -> 'TradeItem':
+        return TradeItem(**dict(trade, fee=OrderFee.map(trade.get('fee'))))
+
+    @staticmethod
+    def columns(trades: List['TradeItem']) -> Dict[str, list]:
+        # Columns hold scalars, the fee is split into its parts and the per-currency fees list is left out
+        columns = {k: [getattr(t, k) for t in trades] for k in TradeItem.__slots__ if k not in ('fee', 'fees')}
+
+        for key in OrderFee.__slots__:
+            columns['fee_' + key] = [getattr(t.fee, key) if t.fee is not None else None for t in trades]
+
+        return columns
+
 
+class Offer(Model):
+    __slots__ = ('price', 'amount')
 
-class Offer:
     price: float
     amount: float
 
+    def __init__(self, price: float, amount: float):
+        self.price = price
+        self.amount = amount
+
     @staticmethod
-    def map(v: list) -> dict:
-        return {
-            'price': v[0],
-            'amount': v[1],
-        }
+    def map(v: list) -> 'Offer':
+        return Offer(v[0], v[1])
 
 
 class OrderBook:
@@ -152,16 +286,32 @@ class Balance:
             setattr(self, k, v or 0)
 
 
-class OrderFee:
+class OrderFee(Model):
+    __slots__ = ('currency', 'cost', 'rate')
+
     currency: str
     cost: float
     rate: float
 
+    def __init__(self, currency: str = None, cost: float = None, rate: float = None):
+        self.currency = currency
+        self.cost = cost
+        self.rate = rate
+
+    @staticmethod
+    def map(fee: dict) -> 'OrderFee':
+        return OrderFee(fee.get('currency'), fee.get('cost'), fee.get('rate')) if fee else None
+
+
+class Order(Model):
+    __slots__ = ('id', 'clientOrderId', 'timestamp', 'datetime', 'lastTradeTimestamp', 'lastUpdateTimestamp', 'status',
+                 'symbol', 'type', 'timeInForce', 'postOnly', 'reduceOnly', 'side', 'price', 'triggerPrice',
+                 'stopPrice', 'takeProfitPrice', 'stopLossPrice', 'average', 'amount', 'filled', 'remaining', 'cost',
+                 'trades', 'fee', 'fees')
 
-class Order:
     id: str
     timestamp: int
-    last_trade: int
+    lastTradeTimestamp: int
     status: str
     symbol: str
     type: str
@@ -171,8 +321,19 @@ class Order:
     filled: float
     remaining: float
     cost: float
+    trades: List[TradeItem]
     fee: OrderFee
 
+    def __init__(self, **values):
+        for key in self.__slots__:
+            setattr(self, key, values.get(key))
+
+    @staticmethod
+    def map(order: dict) -> 'Order':
+        trades = [TradeItem.map(t) for t in order['trades']] if order.get('trades') is not None else None
+
+        return Order(**dict(order, trades=trades, fee=OrderFee.map(order.get('fee'))))
+
 
 class ExchangeProxy:
     name: str
@@ -180,6 +341,9 @@ class ExchangeProxy:
     def __init__(self, name: str):
         self.name = name
 
+    def concurrency(self) -> int:
+        return 1
+
     @abstractmethod
     def features(self) -> ExchangeFeatures:
         pass
@@ -205,7 +369,11 @@ class ExchangeProxy:
         pass
 
     @abstractmethod
-    async def ohlcv(self, symbol: Symbol, timeframe: str = '1m', since: int = None, limit: int = None) -> List[OHLCV]:
+    def timeframe(self, timeframe: str) -> str:
+        pass
+
+    @abstractmethod
+    async def ohlcv(self, symbol: Symbol, timeframe: str = '1m', since: int = None, limit: int = None) -> Candles:
         pass
 
     @abstractmethod
@@ -233,7 +401,7 @@ class ExchangeProxy:
         pass
 
     @abstractmethod
-    async def create_order(self, symbol: Symbol, type: str, side: str, amount: float, price: float = None) -> Order:
+    async def create_order(self, symbol: Symbol, type: str, side: str, amount: float, price: float = None, client_id: str = None) -> Order:
         pass
 
     @abstractmethod
@@ -0,0 +1,162 @@
+import numpy as np
+
+from typing import List
+
+from domain.models import OrderBook, Offer
+
+
+class BookSide(object):
+    """Price levels kept sorted in two parallel arrays, bids are stored under negated prices"""
+
+    descending: bool
+    keys: np.ndarray
+    amounts: np.ndarray
+
+    def __init__(self, descending: bool):
+        self.descending = descending
+        self.keys = np.empty(0)
+        self.amounts = np.empty(0)
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def prices(self) -> np.ndarray:
+        return -self.keys if self.descending else self.keys
+
+    def snapshot(self, levels: List[list]):
+        keys, amounts = self._parse(levels)
+        order = np.argsort(keys, kind='stable')
+        keep = amounts[order] > 0
+
+        self.keys = keys[order][keep]
+        self.amounts = amounts[order][keep]
+
+    def apply(self, levels: List[list]):
+        keys, amounts = self._parse(levels)
+
+        if len(keys) == 0:
+            return
+
+        # A delta replaces the amount at its price, a zero amount removes the level
+        keep = ~np.isin(self.keys, keys)
+        fresh = amounts > 0
+
+        keys = np.concatenate([self.keys[keep], keys[fresh]])
+        amounts = np.concatenate([self.amounts[keep], amounts[fresh]])
+        order = np.argsort(keys, kind='stable')
+
+        self.keys = keys[order]
+        self.amounts = amounts[order]
+
+    def changes(self, levels: List[list]) -> List[list]:
+        """Deltas that turn this side into the given snapshot, removed levels carry a zero amount"""
+        keys, amounts = self._parse(levels)
+        known = dict(zip(self.keys.tolist(), self.amounts.tolist()))
+        current = {k: a for k, a in zip(keys.tolist(), amounts.tolist()) if a > 0}
+
+        changes = [[k, a] for k, a in current.items() if known.get(k) != a]
+        changes += [[k, 0] for k in known if k not in current]
+
+        return [[-k if self.descending else k, a] for k, a in changes]
+
+    def levels(self, depth: int = None, group: float = None) -> List[Offer]:
+        prices, amounts = self.prices, self.amounts
+
+        if group:
+            prices, amounts = self._group(prices, amounts, group)
+
+        prices, amounts = prices[:depth], amounts[:depth]
+
+        return [Offer(p, a) for p, a in zip(prices.tolist(), amounts.tolist())]
+
+    def walk(self, amount: float) -> dict:
+        if len(self.keys) == 0:
+            return {'filled': 0.0, 'cost': 0.0, 'best': None, 'worst': None, 'levels': 0}
+
+        prices = self.prices
+        total = np.cumsum(self.amounts)
+        last = min(int(np.searchsorted(total, amount, 'left')), len(total) - 1)
+        before = total[last - 1] if last > 0 else 0.0
+        filled = min(float(amount), float(total[last]))
+
+        cost = float(np.dot(prices[:last], self.amounts[:last]) + (filled - before) * prices[last])
+
+        return {
+            'filled': filled,
+            'cost': cost,
+            'best': float(prices[0]),
+            'worst': float(prices[last]),
+            'levels': last + 1,
+        }
+
+    def _group(self, prices: np.ndarray, amounts: np.ndarray, step: float):
+        # Round away from the spread so a bucket never looks better than the levels inside it
+        buckets = np.floor(prices / step) if self.descending else np.ceil(prices / step)
+        buckets = np.round(buckets * step, 12)
+
+        # Levels are sorted, so equal buckets are contiguous
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]]) if len(buckets) else np.empty(0, int)
+
+        return buckets[starts], np.add.reduceat(amounts, starts) if len(starts) else amounts
+
+    def _parse(self, levels: List[list]):
+        prices = np.fromiter((level[0] for level in levels), float, len(levels))
+        amounts = np.fromiter((level[1] for level in levels), float, len(levels))
+
+        return (-prices if self.descending else prices), amounts
+
+
+class LocalBook(object):
+    BUY = 'buy'
+    SELL = 'sell'
+
+    bids: BookSide
+    asks: BookSide
+    timestamp: int
+    nonce: int
+
+    def __init__(self):
+        self.bids = BookSide(True)
+        self.asks = BookSide(False)
+        self.timestamp = None
+        self.nonce = None
+
+    @staticmethod
+    def parse(book: dict) -> 'LocalBook':
+        local = LocalBook()
+        local.snapshot(book)
+
+        return local
+
+    def snapshot(self, book: dict):
+        self.bids.snapshot(book.get('bids') or [])
+        self.asks.snapshot(book.get('asks') or [])
+        self.timestamp = book.get('timestamp')
+        self.nonce = book.get('nonce')
+
+    def apply(self, bids: List[list], asks: List[list], nonce: int = None, timestamp: int = None):
+        if nonce is not None and self.nonce is not None and nonce <= self.nonce:
+            return
+
+        self.bids.apply(bids)
+        self.asks.apply(asks)
+        self.nonce = nonce if nonce is not None else self.nonce
+        self.timestamp = timestamp if timestamp is not None else self.timestamp
+
+    def changes(self, book: dict) -> dict:
+        return {'bids': self.bids.changes(book.get('bids') or []), 'asks': self.asks.changes(book.get('asks') or [])}
+
+    def book(self, depth: int = None, group: float = None) -> OrderBook:
+        return OrderBook(self.bids.levels(depth, group), self.asks.levels(depth, group))
+
+    def impact(self, side: str, amount: float) -> dict:
+        # Buying takes liquidity from the asks, selling from the bids
+        walk = (self.asks if side == self.BUY else self.bids).walk(amount)
+        vwap = walk['cost'] / walk['filled'] if walk['filled'] else None
+        slippage = None
+
+        if vwap is not None:
+            slippage = (vwap - walk['best']) / walk['best'] if side == self.BUY else (walk['best'] - vwap) / walk['best']
+
+        return dict(walk, side=side, amount=amount, vwap=vwap, slippage=slippage, complete=walk['filled'] >= amount)
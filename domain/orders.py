@@ -0,0 +1,82 @@
+import asyncio
+import hashlib
+
+from os import environ
+from time import monotonic
+from collections import OrderedDict
+
+
+class OrderIndex(object):
+    """Orders placed with a client order id, so retried requests get the original order back"""
+
+    # Venues whose ccxt createOrder maps clientOrderId onto their own field, others may reject it as unknown
+    VENUES = 'binance,bitfinex,bitget,bitstamp,bybit,coinbase,cryptocom,gate,gemini,htx,okx,phemex,woo'
+
+    entries = OrderedDict()
+    pending = {}
+
+    @staticmethod
+    def forwards(name: str) -> bool:
+        return name in environ.get('CCXT_CLIENT_ORDER_ID', OrderIndex.VENUES).split(',')
+
+    @staticmethod
+    def ttl() -> float:
+        return float(environ.get('CCXT_ORDERS_TTL', 86400))
+
+    @staticmethod
+    def size() -> int:
+        return int(environ.get('CCXT_ORDERS_SIZE', 10000))
+
+    @staticmethod
+    def key(name: str, api_key: str, client_id: str) -> tuple:
+        # Client ids are only unique per account, the key itself is never stored
+        return name, hashlib.sha256((api_key or '').encode()).hexdigest(), client_id
+
+    @classmethod
+    def get(cls, key: tuple) -> dict:
+        item = cls.entries.get(key)
+
+        if item is None:
+            return None
+
+        order, created = item
+
+        if monotonic() - created >= cls.ttl():
+            del cls.entries[key]
+
+            return None
+
+        return order
+
+    @classmethod
+    def put(cls, key: tuple, order: dict):
+        cls.entries.pop(key, None)
+        cls.entries[key] = (order, monotonic())
+
+        while len(cls.entries) > cls.size():
+            cls.entries.popitem(last=False)
+
+    @classmethod
+    async def place(cls, key: tuple, loader) -> dict:
+        order = cls.get(key)
+
+        if order is not None:
+            return order
+
+        # Concurrent duplicates wait for the first request instead of placing a second order
+        future = cls.pending.get(key)
+
+        if future is None:
+            future = asyncio.ensure_future(loader())
+            future.add_done_callback(lambda f: cls._done(key, f))
+
+            cls.pending[key] = future
+
+        return await asyncio.shield(future)
+
+    @classmethod
+    def _done(cls, key: tuple, future: asyncio.Future):
+        cls.pending.pop(key, None)
+
+        if not future.cancelled() and future.exception() is None:
+            cls.put(key, future.result())
@@ -0,0 +1,95 @@
+import hashlib
+
+from os import environ
+from time import monotonic
+from collections import OrderedDict
+
+from domain.models import ExchangeProxy
+
+
+class PoolEntry(object):
+    proxy: ExchangeProxy
+    used: float
+    refs: int
+
+    def __init__(self, proxy: ExchangeProxy):
+        self.proxy = proxy
+        self.used = monotonic()
+        self.refs = 0
+
+
+class ExchangePool(object):
+    size: int
+    idle: float
+    entries: OrderedDict
+
+    def __init__(self, size: int = None, idle: float = None):
+        self.size = size or int(environ.get('CCXT_POOL_SIZE', 64))
+        self.idle = idle or float(environ.get('CCXT_POOL_IDLE', 300))
+        self.entries = OrderedDict()
+
+    @staticmethod
+    def fingerprint(params: dict = None) -> str:
+        if not params:
+            return ''
+
+        values = repr(sorted((str(k), str(v)) for k, v in params.items()))
+
+        return hashlib.sha256(values.encode()).hexdigest()
+
+    async def acquire(self, key: tuple, loader) -> ExchangeProxy:
+        entry = self.entries.get(key)
+
+        if entry is None:
+            proxy = await loader()
+
+            # Another request may have warmed the same key while we were loading
+            entry = self.entries.get(key)
+
+            if entry is None:
+                entry = PoolEntry(proxy)
+                self.entries[key] = entry
+            else:
+                await proxy.close()
+
+        self.entries.move_to_end(key)
+
+        entry.refs += 1
+        entry.used = monotonic()
+
+        await self.evict()
+
+        return entry.proxy
+
+    def release(self, key: tuple):
+        entry = self.entries.get(key)
+
+        if entry is not None:
+            entry.refs = max(entry.refs - 1, 0)
+            entry.used = monotonic()
+
+            self.entries.move_to_end(key)
+
+    async def evict(self):
+        deadline = monotonic() - self.idle
+        overflow = len(self.entries) - self.size
+
+        for key, entry in list(self.entries.items()):
+            if entry.used > deadline and overflow <= 0:
+                break
+
+            if entry.refs > 0:
+                continue
+
+            del self.entries[key]
+            overflow -= 1
+
+            await entry.proxy.close()
+
+    async def close(self):
+        entries = list(self.entries.values())
+
+        self.entries.clear()
+
+        for entry in entries:
+            await entry.proxy.close()
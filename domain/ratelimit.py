@@ -0,0 +1,71 @@
+import asyncio
+import zlib
+import multiprocessing
+
+from os import environ
+from time import time
+
+
+class SharedBuckets(object):
+    """GCRA token buckets kept in shared memory so forked Sanic workers throttle together"""
+
+    def __init__(self, slots: int):
+        self.slots = slots
+        self.keys = multiprocessing.RawArray('d', slots)
+        self.tats = multiprocessing.RawArray('d', slots)
+        self.lock = multiprocessing.Lock()
+
+    def reserve(self, key: str, interval: float, burst: int = 1) -> float:
+        marker = float(zlib.crc32(key.encode()) + 1)
+
+        with self.lock:
+            slot = self._slot(marker)
+            now = time()
+            tat = max(self.tats[slot], now)
+
+            self.tats[slot] = tat + interval
+
+        # Requests are granted in arrival order, each one waits for its own slot
+        return max(0.0, tat - (burst - 1) * interval - now)
+
+    def _slot(self, marker: float) -> int:
+        start = int(marker) % self.slots
+
+        for i in range(self.slots):
+            slot = (start + i) % self.slots
+
+            if self.keys[slot] == marker:
+                return slot
+
+            if self.keys[slot] == 0:
+                self.keys[slot] = marker
+
+                return slot
+
+        # Table is full, colliding keys simply share a bucket which only makes them stricter
+        return start
+
+
+class RateLimiter(object):
+    # Allocated on import, i.e. in the master process before the workers are forked
+    buckets = SharedBuckets(int(environ.get('CCXT_RATELIMIT_SLOTS', 1024)))
+
+    key: str
+    interval: float
+    burst: int
+
+    def __init__(self, name: str, api_key: str = None, rate_limit: float = None):
+        override = environ.get('CCXT_RATELIMIT_%s' % name.upper())
+
+        self.key = '%s:%s' % (name, api_key or '')
+        self.interval = float(override or rate_limit or 0) / 1000
+        self.burst = int(environ.get('CCXT_RATELIMIT_BURST', 1))
+
+    async def throttle(self, cost: float = None):
+        if self.interval <= 0:
+            return
+
+        delay = self.buckets.reserve(self.key, self.interval * (cost or 1), self.burst)
+
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -0,0 +1,81 @@
+import asyncio
+import random
+
+from os import environ
+from time import monotonic
+
+from ccxt import NetworkError
+
+
+class RetryBudget(object):
+    """Retries per exchange are capped to a fraction of recent successful calls, shared by all instances"""
+
+    tokens = {}
+
+    @staticmethod
+    def size() -> float:
+        return float(environ.get('CCXT_RETRY_BUDGET', 10))
+
+    @staticmethod
+    def ratio() -> float:
+        return float(environ.get('CCXT_RETRY_RATIO', 0.2))
+
+    @classmethod
+    def deposit(cls, name: str):
+        cls.tokens[name] = min(cls.size(), cls.tokens.get(name, cls.size()) + cls.ratio())
+
+    @classmethod
+    def withdraw(cls, name: str) -> bool:
+        tokens = cls.tokens.get(name, cls.size())
+
+        if tokens < 1:
+            return False
+
+        cls.tokens[name] = tokens - 1
+
+        return True
+
+
+class RetryPolicy(object):
+    attempts: int
+    base: float
+    cap: float
+    deadline: float
+
+    def __init__(self, attempts: int = None, base: float = None, cap: float = None, deadline: float = None):
+        self.attempts = attempts or int(environ.get('CCXT_RETRY_ATTEMPTS', 4))
+        self.base = base or float(environ.get('CCXT_RETRY_BASE', 0.2))
+        self.cap = cap or float(environ.get('CCXT_RETRY_CAP', 2))
+        self.deadline = deadline or float(environ.get('CCXT_RETRY_DEADLINE', 10))
+
+    @staticmethod
+    def retryable(error: Exception) -> bool:
+        # Network level failures are transient, anything the venue actually answered is not
+        return isinstance(error, NetworkError)
+
+    def backoff(self, attempt: int) -> float:
+        # Full jitter keeps retries of concurrent callers from lining up on the same instant
+        return random.uniform(0, min(self.cap, self.base * 2 ** attempt))
+
+    async def run(self, name: str, call):
+        deadline = monotonic() + self.deadline
+        attempt = 0
+
+        while True:
+            try:
+                result = await call()
+            except Exception as error:
+                attempt += 1
+                delay = self.backoff(attempt)
+
+                if not self.retryable(error) or attempt >= self.attempts or monotonic() + delay > deadline:
+                    raise
+
+                if not RetryBudget.withdraw(name):
+                    raise
+
+                await asyncio.sleep(delay)
+            else:
+                RetryBudget.deposit(name)
+
+                return result
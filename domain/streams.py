@@ -0,0 +1,345 @@
+import asyncio
+
+from abc import abstractmethod
+from os import environ
+from time import time
+from typing import List
+from ccxt import Exchange
+
+from domain.errors import InvalidOperation
+from domain.factory import ExchangeFactory
+from domain.models import ExchangeProxy, Symbol, Candles, TradeItem
+from domain.orderbook import LocalBook
+
+
+class StreamClient(object):
+    DROP = 'drop'
+    CLOSE = 'close'
+
+    queue: asyncio.Queue
+    policy: str
+    closed: bool
+
+    def __init__(self, policy: str = None, size: int = None):
+        self.queue = asyncio.Queue(size or int(environ.get('CCXT_STREAM_QUEUE', 100)))
+        self.policy = policy if policy in (self.DROP, self.CLOSE) else self.DROP
+        self.closed = False
+        self.stale = set()
+        self.feeds = set()
+
+    def push(self, key: tuple, message: dict):
+        if self.closed:
+            return
+
+        if self.queue.full():
+            if self.policy == self.CLOSE:
+                self.close()
+
+                return
+
+            # Drop the oldest message; a dropped diff makes that feed resend a snapshot
+            dropped, _ = self.queue.get_nowait()
+            self.stale.add(dropped)
+
+        self.queue.put_nowait((key, message))
+
+    def close(self):
+        self.closed = True
+
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+        self.queue.put_nowait((None, None))
+
+    async def next(self) -> dict:
+        _, message = await self.queue.get()
+
+        return message
+
+
+class Feed(object):
+    channel = None
+    interval = 1000
+
+    name: str
+    symbol: Symbol
+    key: tuple
+    clients: set
+    state: object
+
+    def __init__(self, name: str, symbol: Symbol):
+        self.name = name
+        self.symbol = symbol
+        self.key = (name, self.channel, str(symbol))
+        self.clients = set()
+        self.task = None
+        self.state = None
+
+    @abstractmethod
+    async def poll(self, exchange: ExchangeProxy):
+        pass
+
+    @abstractmethod
+    def update(self, data) -> List[dict]:
+        pass
+
+    def snapshot(self) -> dict:
+        return self.message('snapshot', self.state)
+
+    def delay(self) -> float:
+        return float(environ.get('CCXT_STREAM_%s_INTERVAL' % self.channel.upper(), self.interval)) / 1000
+
+    def message(self, _type: str, data) -> dict:
+        return {
+            'exchange': self.name,
+            'channel': self.channel,
+            'symbol': str(self.symbol),
+            'type': _type,
+            'data': data,
+        }
+
+    def join(self, client: StreamClient):
+        self.clients.add(client)
+
+        if self.state is not None:
+            client.push(self.key, self.snapshot())
+
+        if self.task is None or self.task.done():
+            self.task = asyncio.ensure_future(self.run())
+
+    def leave(self, client: StreamClient):
+        self.clients.discard(client)
+
+        if not self.clients and self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    async def run(self):
+        while self.clients:
+            try:
+                async with ExchangeFactory.acquire(self.name) as exchange:
+                    data = await self.poll(exchange)
+
+                messages = self.update(data)
+
+                for client in list(self.clients):
+                    if self.key in client.stale:
+                        client.stale.discard(self.key)
+                        client.push(self.key, self.snapshot())
+                    else:
+                        for message in messages:
+                            client.push(self.key, message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                for client in list(self.clients):
+                    client.push(self.key, self.message('error', {
+                        'title': error.__class__.__name__,
+                        'detail': str(error),
+                    }))
+
+            await asyncio.sleep(self.delay())
+
+
+class TickerFeed(Feed):
+    channel = 'ticker'
+    interval = 1000
+
+    async def poll(self, exchange: ExchangeProxy):
+        return await exchange.ticker(self.symbol)
+
+    def update(self, data) -> List[dict]:
+        if data == self.state:
+            return []
+
+        self.state = data
+
+        return [self.message('update', data)]
+
+
+class TradesFeed(Feed):
+    channel = 'trades'
+    interval = 1000
+
+    async def poll(self, exchange: ExchangeProxy):
+        since = self.state[-1].timestamp if self.state else None
+
+        return await exchange.trades(self.symbol, since)
+
+    def update(self, data: List[TradeItem]) -> List[dict]:
+        seen = {TradesFeed.identity(t) for t in self.state or []}
+        fresh = [t for t in data if TradesFeed.identity(t) not in seen]
+
+        if not fresh:
+            return []
+
+        self.state = ((self.state or []) + fresh)[-int(environ.get('CCXT_STREAM_TRADES', 100)):]
+
+        return [self.message('update', fresh)]
+
+    @staticmethod
+    def identity(trade: TradeItem) -> tuple:
+        return trade.id, trade.timestamp, trade.price, trade.amount
+
+
+class BookFeed(Feed):
+    channel = 'book'
+    interval = 500
+
+    async def poll(self, exchange: ExchangeProxy):
+        return await exchange.book(self.symbol)
+
+    def snapshot(self) -> dict:
+        book = self.state.book()
+
+        return self.message('snapshot', {
+            'bids': [[o.price, o.amount] for o in book.bids],
+            'asks': [[o.price, o.amount] for o in book.asks],
+        })
+
+    def update(self, data) -> List[dict]:
+        levels = {
+            'bids': [[o.price, o.amount] for o in data.bids],
+            'asks': [[o.price, o.amount] for o in data.asks],
+        }
+
+        if self.state is None:
+            self.state = LocalBook.parse(levels)
+
+            return [self.snapshot()]
+
+        # The feed's book only moves by the deltas it sends, so it stays what the clients have rebuilt
+        diff = self.state.changes(levels)
+
+        if not diff['bids'] and not diff['asks']:
+            return []
+
+        self.state.apply(diff['bids'], diff['asks'])
+
+        return [self.message('diff', diff)]
+
+
+class CandleFeed(Feed):
+    channel = 'ohlcv'
+    interval = 5000
+
+    timeframe: str
+    size: int
+
+    def __init__(self, name: str, symbol: Symbol, timeframe: str = '1m'):
+        super().__init__(name, symbol)
+
+        self.timeframe = timeframe
+
+        try:
+            self.size = Exchange.parse_timeframe(timeframe) * 1000
+        except ValueError:
+            self.size = 0
+
+        # delay() aligns on candle boundaries, a zero size would kill the feed's task
+        if self.size <= 0:
+            raise InvalidOperation(timeframe)
+
+        self.key = self.key + (timeframe,)
+
+    async def poll(self, exchange: ExchangeProxy):
+        if self.state is None or self.state['closed'] is None:
+            return await exchange.ohlcv(self.symbol, self.timeframe, None, 2)
+
+        return await exchange.ohlcv(self.symbol, self.timeframe, self.state['closed'].t + self.size)
+
+    def delay(self) -> float:
+        now = time() * 1000
+        grace = float(environ.get('CCXT_STREAM_OHLCV_GRACE', 1000))
+
+        # Wake up right after the candle closes, and poll the forming one at the regular interval meanwhile
+        boundary = now - now % self.size + self.size + grace - now
+
+        return min(super().delay() * 1000, boundary) / 1000
+
+    def update(self, data: Candles) -> List[dict]:
+        now = time() * 1000
+        rows = data.rows()
+
+        closed = [row for row in rows if row.t + self.size <= now]
+        forming = rows[-1] if rows and rows[-1].t + self.size > now else None
+
+        if self.state is None:
+            self.state = {'closed': closed[-1] if closed else None, 'forming': forming}
+
+            return [self.snapshot()]
+
+        messages = []
+
+        for row in closed:
+            if self.state['closed'] is None or row.t > self.state['closed'].t:
+                self.state['closed'] = row
+                messages.append(self.message('close', row))
+
+        if forming is not None and forming != self.state['forming']:
+            messages.append(self.message('candle', forming))
+
+        self.state['forming'] = forming
+
+        return messages
+
+
+class StreamHub(object):
+    channels = {
+        TickerFeed.channel: TickerFeed,
+        TradesFeed.channel: TradesFeed,
+        BookFeed.channel: BookFeed,
+        CandleFeed.channel: CandleFeed,
+    }
+    feeds = {}
+
+    @classmethod
+    def subscribe(cls, client: StreamClient, name: str, channel: str, symbol: Symbol, **options) -> tuple:
+        if channel not in cls.channels:
+            raise InvalidOperation(channel)
+
+        feed = cls.channels[channel](name, symbol, **options)
+
+        # Every feed polls the venue on its own, one client must not be able to start an unbounded number
+        if feed.key not in client.feeds and len(client.feeds) >= int(environ.get('CCXT_STREAM_FEEDS', 20)):
+            raise InvalidOperation('At most %d subscriptions per client' % len(client.feeds))
+
+        feed = cls.feeds.setdefault(feed.key, feed)
+
+        if feed.key not in client.feeds:
+            client.feeds.add(feed.key)
+            feed.join(client)
+
+        return feed.key
+
+    @classmethod
+    def key(cls, name: str, channel: str, symbol: Symbol, **options) -> tuple:
+        if channel not in cls.channels:
+            raise InvalidOperation(channel)
+
+        return cls.channels[channel](name, symbol, **options).key
+
+    @classmethod
+    def unsubscribe(cls, client: StreamClient, key: tuple):
+        client.feeds.discard(key)
+
+        feed = cls.feeds.get(key)
+
+        if feed is not None:
+            feed.leave(client)
+
+            if not feed.clients:
+                del cls.feeds[key]
+
+    @classmethod
+    def leave(cls, client: StreamClient):
+        for key in list(client.feeds):
+            cls.unsubscribe(client, key)
+
+    @classmethod
+    def close(cls):
+        for feed in cls.feeds.values():
+            if feed.task is not None:
+                feed.task.cancel()
+
+        cls.feeds.clear()
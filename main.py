@@ -2,12 +2,13 @@ import argparse
 
 from sanic import Sanic
 from core.extentions.exceptions import blueprint as ext_exceptions
-# from core.extentions.middlewares import blueprint as ext_middlewares
+from core.extentions.middlewares import blueprint as ext_middlewares
 
 from settings import Settings
 
 from apps.ccxt import blueprint as ccxt_app
 from apps.redoc import blueprint as redoc_app
+from apps.status import blueprint as status_app
 from sanic_openapi3 import blueprint as openapi_blueprint
 
 # Command line parser options & setup default values
@@ -25,11 +26,12 @@ app.config.from_object(Settings())
 
 # Install extentions
 app.blueprint(ext_exceptions)
-# app.blueprint(ext_middlewares)
+app.blueprint(ext_middlewares)
 
 # Install apps
 app.blueprint(ccxt_app)
 app.blueprint(redoc_app)
+app.blueprint(status_app)
 app.blueprint(openapi_blueprint)
 
 # Running sanic, we need to make sure directly run by interpreter
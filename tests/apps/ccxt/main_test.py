@@ -0,0 +1,60 @@
+import unittest
+from http import HTTPStatus
+from unittest import mock
+from contextlib import asynccontextmanager
+
+from domain.factory import ExchangeFactory
+from domain.models import Ticker
+from domain.streams import StreamHub
+from tests import build_full_app
+
+
+class OHLCVStreamTest(unittest.TestCase):
+    def setUp(self):
+        self.app = build_full_app()
+
+    def subscribe(self, client, name, channel, symbol, **options):
+        client.push(None, {'type': 'close', 'data': [1, 2, 3, 1, 2, 10]})
+        client.queue.put_nowait((None, None))
+
+        return (name, channel, str(symbol), options['timeframe'])
+
+    def test_streams_events(self):
+        with mock.patch.object(StreamHub, 'subscribe', self.subscribe), mock.patch.object(StreamHub, 'leave'):
+            request, response = self.app.test_client.get('/ccxt/binance/ohlcv/BTC/USDT/stream?timeframe=1m')
+
+        self.assertEqual(HTTPStatus.OK, response.status)
+        self.assertEqual('text/event-stream', response.headers['Content-Type'])
+        self.assertEqual('event: close\ndata: [1,2,3,1,2,10]\n\n', response.text)
+
+
+class TickersTest(unittest.TestCase):
+    def setUp(self):
+        self.app = build_full_app()
+        self.calls = 0
+
+    @asynccontextmanager
+    async def acquire(self, name, params=None):
+        exchange = mock.Mock()
+
+        async def tickers():
+            self.calls += 1
+
+            return {'BTC/USDT': Ticker(symbol='BTC/USDT', bid=1.0, ask=2.0)}
+
+        exchange.tickers = tickers
+
+        yield exchange
+
+    def test_fields_share_one_upstream_call(self):
+        with mock.patch.object(ExchangeFactory, 'acquire', self.acquire):
+            _, bids = self.app.test_client.get('/ccxt/fakevenue/tickers?fields=bid')
+            _, asks = self.app.test_client.get('/ccxt/fakevenue/tickers?fields=ask')
+
+        self.assertEqual([{'bid': 1.0}], bids.json)
+        self.assertEqual([{'ask': 2.0}], asks.json)
+        self.assertEqual(1, self.calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import gzip
+import unittest
+
+from types import SimpleNamespace
+from sanic.response import raw
+
+from core.extentions import middlewares
+from core.extentions.middlewares import compress_response
+
+
+class CompressResponseTest(unittest.TestCase):
+    def setUp(self):
+        self.body = b'{"symbol":"BTC/USDT"}' * 100
+
+        middlewares.compressed.clear()
+
+    def request(self, encoding: str = 'gzip', **config):
+        return SimpleNamespace(headers={'Accept-Encoding': encoding}, app=SimpleNamespace(config=config))
+
+    def response(self, body: bytes = None, **headers):
+        return raw(self.body if body is None else body, headers=headers, content_type='application/json')
+
+    def test_compresses_above_threshold(self):
+        response = self.response(Vary='Accept')
+
+        compress_response(self.request(), response)
+
+        self.assertEqual('gzip', response.headers['Content-Encoding'])
+        self.assertEqual('Accept, Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(self.body, gzip.decompress(response.body))
+
+    def test_skips_small_bodies(self):
+        response = self.response(b'{}')
+
+        compress_response(self.request(CCXT_COMPRESS_MIN=1024), response)
+
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(b'{}', response.body)
+
+    def test_negotiates_encoding(self):
+        for accept in ('identity', 'gzip;q=0', ''):
+            response = self.response()
+
+            compress_response(self.request(accept), response)
+
+            self.assertNotIn('Content-Encoding', response.headers, accept)
+
+        response = self.response()
+
+        compress_response(self.request('br;q=0, gzip;q=0.5'), response)
+
+        self.assertEqual('gzip', response.headers['Content-Encoding'])
+
+    def test_caches_bodies_by_etag(self):
+        first, second = self.response(ETag='"a"'), self.response(ETag='"a"')
+
+        compress_response(self.request(), first)
+        compress_response(self.request(), second)
+
+        self.assertIs(first.body, second.body)
+        self.assertEqual([('"a"', 'gzip')], list(middlewares.compressed))
+
+    def test_cache_is_bounded(self):
+        for etag in ('"a"', '"b"', '"c"'):
+            compress_response(self.request(CCXT_COMPRESS_CACHE=2), self.response(ETag=etag))
+
+        self.assertEqual([('"b"', 'gzip'), ('"c"', 'gzip')], list(middlewares.compressed))
+
+
+if __name__ == '__main__':
+    unittest.main()
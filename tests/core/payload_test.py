@@ -0,0 +1,96 @@
+import unittest
+import msgpack
+import pyarrow
+
+from http import HTTPStatus
+from types import SimpleNamespace
+from email.utils import formatdate
+
+from core.helpers.payload import Payload, response, negotiate, render, arrow, JSON, MSGPACK, ARROW
+
+
+class ConditionalResponseTest(unittest.TestCase):
+    def setUp(self):
+        self.payload = Payload({'BTC/USDT': {'bid': 1.0, 'ask': 2.0}})
+
+    def request(self, **headers):
+        return SimpleNamespace(headers=headers)
+
+    def test_serves_body_with_validators(self):
+        result = response(self.request(), self.payload, max_age=30)
+
+        self.assertEqual(HTTPStatus.OK, result.status)
+        self.assertEqual(self.payload.body, result.body)
+        self.assertEqual(self.payload.etag, result.headers['ETag'])
+        self.assertEqual('public, max-age=30', result.headers['Cache-Control'])
+        self.assertIn('Last-Modified', result.headers)
+
+    def test_not_modified_on_matching_etag(self):
+        for tags in (self.payload.etag, 'W/' + self.payload.etag, '"other", ' + self.payload.etag, '*'):
+            result = response(self.request(**{'If-None-Match': tags}), self.payload)
+
+            self.assertEqual(HTTPStatus.NOT_MODIFIED, result.status, tags)
+            self.assertEqual(b'', result.body)
+            self.assertEqual(self.payload.etag, result.headers['ETag'])
+
+    def test_modified_on_other_etag(self):
+        result = response(self.request(**{'If-None-Match': '"other"'}), self.payload)
+
+        self.assertEqual(HTTPStatus.OK, result.status)
+
+    def test_if_none_match_takes_precedence(self):
+        since = formatdate(self.payload.modified + 60, usegmt=True)
+        result = response(self.request(**{'If-None-Match': '"other"', 'If-Modified-Since': since}), self.payload)
+
+        self.assertEqual(HTTPStatus.OK, result.status)
+
+    def test_not_modified_since(self):
+        later = formatdate(self.payload.modified + 60, usegmt=True)
+        earlier = formatdate(self.payload.modified - 60, usegmt=True)
+
+        self.assertEqual(HTTPStatus.NOT_MODIFIED, response(self.request(**{'If-Modified-Since': later}), self.payload).status)
+        self.assertEqual(HTTPStatus.OK, response(self.request(**{'If-Modified-Since': earlier}), self.payload).status)
+        self.assertEqual(HTTPStatus.OK, response(self.request(**{'If-Modified-Since': 'never'}), self.payload).status)
+
+
+class NegotiationTest(unittest.TestCase):
+    def request(self, accept: str = None):
+        return SimpleNamespace(headers={'Accept': accept} if accept is not None else {})
+
+    def test_negotiate(self):
+        self.assertEqual(JSON, negotiate(self.request()))
+        self.assertEqual(JSON, negotiate(self.request('text/html, */*')))
+        self.assertEqual(MSGPACK, negotiate(self.request('application/x-msgpack')))
+        self.assertEqual(ARROW, negotiate(self.request(ARROW + ';q=1, ' + MSGPACK), columnar=True))
+
+        # Arrow needs columns, row data falls through to the next acceptable type
+        self.assertEqual(MSGPACK, negotiate(self.request(ARROW + ', ' + MSGPACK)))
+
+    def test_render(self):
+        data = [{'t': 1, 'c': 2.0}, {'t': 2, 'c': None}]
+        columns = {'t': [1, 2], 'c': [2.0, None]}
+
+        result = render(self.request(), data, lambda: columns)
+
+        self.assertEqual(JSON, result.content_type)
+        self.assertEqual('Accept', result.headers['Vary'])
+        self.assertEqual(b'[{"t":1,"c":2.0},{"t":2,"c":null}]', result.body)
+
+        result = render(self.request(MSGPACK), data, lambda: columns)
+
+        self.assertEqual(MSGPACK, result.content_type)
+        self.assertEqual(data, msgpack.unpackb(result.body))
+
+        result = render(self.request(ARROW), data, lambda: columns)
+
+        self.assertEqual(ARROW, result.content_type)
+        self.assertEqual(columns, pyarrow.ipc.open_stream(result.body).read_all().to_pydict())
+
+    def test_arrow_turns_nan_into_null(self):
+        table = pyarrow.ipc.open_stream(arrow({'t': [1, 2], 'c': [1.5, float('nan')]})).read_all()
+
+        self.assertEqual({'t': [1, 2], 'c': [1.5, None]}, table.to_pydict())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import asyncio
+import unittest
+
+from domain.aggregate import Aggregator
+from domain.models import Symbol, Ticker
+
+
+class AggregatorTest(unittest.IsolatedAsyncioTestCase):
+    TICKERS = {
+        'binance': Ticker(bid=100.0, bidVolume=1.0, ask=101.0, askVolume=2.0),
+        'kraken': Ticker(bid=100.5, bidVolume=3.0, ask=101.5, askVolume=4.0),
+        'bitstamp': Ticker(bid=99.0, bidVolume=5.0, ask=100.8, askVolume=6.0),
+    }
+
+    async def fetch(self, name: str, symbol: Symbol) -> Ticker:
+        if name == 'slow':
+            await asyncio.sleep(1)
+
+        return self.TICKERS[name]
+
+    async def test_picks_best_bid_and_ask(self):
+        best = await Aggregator.best(Symbol('BTC', 'USDT'), list(self.TICKERS), self.fetch, 1000)
+
+        self.assertEqual({'exchange': 'kraken', 'price': 100.5, 'amount': 3.0}, best['bid'])
+        self.assertEqual({'exchange': 'bitstamp', 'price': 100.8, 'amount': 6.0}, best['ask'])
+        self.assertAlmostEqual(0.3, best['spread'])
+
+    async def test_drops_venues_that_time_out(self):
+        best = await Aggregator.best(Symbol('BTC', 'USDT'), ['binance', 'slow'], self.fetch, 10)
+
+        self.assertEqual('binance', best['bid']['exchange'])
+        self.assertEqual('TimeoutError', best['venues']['slow']['error']['title'])
+        self.assertNotIn('bid', best['venues']['slow'])
+
+    async def test_no_quotes(self):
+        best = await Aggregator.best(Symbol('BTC', 'USDT'), ['slow'], self.fetch, 10)
+
+        self.assertIsNone(best['bid'])
+        self.assertIsNone(best['ask'])
+        self.assertIsNone(best['spread'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import asyncio
+import unittest
+
+from ccxt import BadSymbol, RequestTimeout
+
+from domain.batch import Batch
+from domain.errors import InvalidSymbol
+
+
+class FakeProxy:
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.calls = []
+
+    def features(self) -> dict:
+        return {'fetchTickers': True}
+
+    def concurrency(self) -> int:
+        return 2
+
+    async def tickers(self, symbols):
+        self.calls.append('tickers')
+
+        if self.error is not None:
+            raise self.error
+
+        return {str(s): {'symbol': str(s)} for s in symbols if s.base != 'BAD'}
+
+    async def ticker(self, symbol):
+        self.calls.append(str(symbol))
+
+        if symbol.base == 'BAD':
+            raise BadSymbol(str(symbol))
+
+        return {'symbol': str(symbol)}
+
+
+class BatchTest(unittest.IsolatedAsyncioTestCase):
+    async def test_reports_partial_results(self):
+        async def call(key: str):
+            if key == 'b':
+                raise ValueError(key)
+
+            return key.upper()
+
+        data, errors = await Batch.run(['a', 'b', 'c'], call, 2)
+
+        self.assertEqual({'a': 'A', 'c': 'C'}, data)
+        self.assertEqual(['b'], list(errors))
+        self.assertIsInstance(errors['b'], ValueError)
+
+    async def test_caps_concurrency(self):
+        running, peak = 0, 0
+
+        async def call(key: str):
+            nonlocal running, peak
+
+            running += 1
+            peak = max(peak, running)
+
+            await asyncio.sleep(0.01)
+
+            running -= 1
+
+        await Batch.run([str(i) for i in range(10)], call, 3)
+
+        self.assertEqual(3, peak)
+
+    async def test_tickers_in_one_call(self):
+        data, errors = await Batch.tickers(FakeProxy(), ['BTC/USDT', 'BAD/USDT'])
+
+        self.assertEqual(['BTC/USDT'], list(data))
+        self.assertIsInstance(errors['BAD/USDT'], InvalidSymbol)
+
+    async def test_tickers_fall_back_per_symbol_on_bad_symbols(self):
+        exchange = FakeProxy(BadSymbol('BAD/USDT'))
+
+        data, errors = await Batch.tickers(exchange, ['BTC/USDT', 'BAD/USDT'])
+
+        self.assertEqual(['BTC/USDT'], list(data))
+        self.assertIsInstance(errors['BAD/USDT'], BadSymbol)
+        self.assertEqual(['tickers', 'BTC/USDT', 'BAD/USDT'], exchange.calls)
+
+    async def test_tickers_raise_network_errors(self):
+        exchange = FakeProxy(RequestTimeout('timeout'))
+
+        with self.assertRaises(RequestTimeout):
+            await Batch.tickers(exchange, ['BTC/USDT', 'ETH/USDT'])
+
+        self.assertEqual(['tickers'], exchange.calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
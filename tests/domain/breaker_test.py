@@ -0,0 +1,73 @@
+import unittest
+
+from os import environ
+from ccxt import RequestTimeout, InvalidOrder, RateLimitExceeded, DDoSProtection
+
+from domain.breaker import CircuitBreaker, timeout
+from domain.errors import ExchangeUnavailable
+
+
+class CircuitBreakerTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker('binance')
+
+        environ['CCXT_BREAKER_CALLS'] = '2'
+
+    def tearDown(self):
+        del environ['CCXT_BREAKER_CALLS']
+
+    async def call(self, error: Exception = None):
+        async def call():
+            if error is not None:
+                raise error
+
+            return True
+
+        return await self.breaker.call(call)
+
+    async def test_opens_on_network_errors(self):
+        for _ in range(2):
+            with self.assertRaises(RequestTimeout):
+                await self.call(RequestTimeout('timeout'))
+
+        with self.assertRaises(ExchangeUnavailable):
+            await self.call()
+
+        self.assertEqual(CircuitBreaker.OPEN, self.breaker.state)
+
+    async def test_ignores_rejected_requests(self):
+        for _ in range(3):
+            with self.assertRaises(InvalidOrder):
+                await self.call(InvalidOrder('rejected'))
+
+        self.assertEqual(CircuitBreaker.CLOSED, self.breaker.state)
+
+    async def test_ignores_throttling(self):
+        for error in (RateLimitExceeded('429'), DDoSProtection('418'), RateLimitExceeded('429')):
+            with self.assertRaises(type(error)):
+                await self.call(error)
+
+        self.assertEqual(CircuitBreaker.CLOSED, self.breaker.state)
+        self.assertEqual(0, self.breaker.status()['errors'])
+
+    async def test_half_open_probe_closes(self):
+        self.breaker._open(0.0)
+
+        self.assertTrue(await self.call())
+        self.assertEqual(CircuitBreaker.CLOSED, self.breaker.state)
+
+    def test_timeouts_prefer_the_most_specific(self):
+        environ['CCXT_TIMEOUT_BINANCE'] = '5000'
+        environ['CCXT_TIMEOUT_FETCH_TICKER'] = '1000'
+
+        try:
+            self.assertEqual(1000, timeout('binance', 'fetch_ticker'))
+            self.assertEqual(5000, timeout('binance', 'fetch_trades'))
+            self.assertEqual(30000, timeout('kraken'))
+        finally:
+            del environ['CCXT_TIMEOUT_BINANCE']
+            del environ['CCXT_TIMEOUT_FETCH_TICKER']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import asyncio
+import unittest
+
+from domain.cache import ResponseCache, CacheResult
+
+
+class ResponseCacheTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.calls = 0
+
+    async def load(self):
+        self.calls += 1
+
+        await asyncio.sleep(0.01)
+
+        return {'bid': 1.0, 'ask': 2.0}
+
+    async def test_coalesces_concurrent_misses(self):
+        cache = ResponseCache()
+
+        results = await asyncio.gather(*[cache.fetch(('ticker', 'binance'), self.load, 1000) for _ in range(5)])
+
+        self.assertEqual(1, self.calls)
+        self.assertEqual(CacheResult.MISS, results[0].status)
+        self.assertEqual({CacheResult.SHARED}, {r.status for r in results[1:]})
+
+    async def test_serves_hits_within_ttl(self):
+        cache = ResponseCache()
+
+        await cache.fetch(('ticker', 'binance'), self.load, 1000)
+        result = await cache.fetch(('ticker', 'binance'), self.load, 1000)
+
+        self.assertEqual(1, self.calls)
+        self.assertEqual(CacheResult.HIT, result.status)
+
+    async def test_serves_stale_while_revalidating(self):
+        cache = ResponseCache()
+
+        await cache.fetch(('tickers', 'binance'), self.load, 0)
+
+        result = await cache.fetch(('tickers', 'binance'), self.load, 0, 1000)
+        await asyncio.sleep(0.02)
+
+        self.assertEqual(CacheResult.STALE, result.status)
+        self.assertEqual(2, self.calls)
+
+    async def test_evicts_least_recently_used(self):
+        cache = ResponseCache(size=1)
+
+        await cache.fetch(('ticker', 'a'), self.load, 1000)
+        await cache.fetch(('ticker', 'b'), self.load, 1000)
+
+        self.assertEqual([('ticker', 'b')], list(cache.entries))
+
+
+if __name__ == '__main__':
+    unittest.main()
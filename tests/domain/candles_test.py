@@ -0,0 +1,101 @@
+import unittest
+
+from timeit import repeat
+from domain.candles import CandleSeries, CandleStore
+from domain.models import Candles
+
+
+class CandleSeriesTest(unittest.TestCase):
+    def setUp(self):
+        self.series = CandleSeries(60000)
+
+    def test_missing_ranges(self):
+        self.series.cover(60000, 180000)
+        self.series.cover(300000, 360000)
+
+        self.assertEqual([(0, 60000), (180000, 300000), (360000, 420000)], self.series.missing(0, 420000))
+        self.assertEqual([], self.series.missing(60000, 180000))
+
+    def test_cover_merges_adjacent(self):
+        self.series.cover(0, 60000)
+        self.series.cover(60000, 120000)
+
+        self.assertEqual([[0, 120000]], self.series.ranges)
+
+    def test_merge_replaces_existing_candles(self):
+        self.series.merge([[0, 1, 2, 0, 1, 10], [60000, 1, 2, 0, 1, 10]])
+        self.series.merge([[60000, 1, 3, 0, 2, 20], [120000, 2, 3, 1, 2, None]])
+
+        self.assertEqual({
+            't': [0, 60000, 120000],
+            'o': [1, 1, 2],
+            'h': [2, 3, 3],
+            'l': [0, 0, 1],
+            'c': [1, 2, 2],
+            'v': [10, 20, None],
+        }, Candles(self.series.data).columns())
+
+    def test_slice_limits(self):
+        self.series.merge([[t * 60000, 1, 1, 1, 1, 1] for t in range(10)])
+
+        self.assertEqual([480000, 540000], self.series.slice(0, 600000, 2, True).t.tolist())
+        self.assertEqual([0, 60000], self.series.slice(0, 600000, 2, False).t.tolist())
+
+    def test_records_match_rows(self):
+        candles = Candles.from_rows([[0, 1, 2, 0, 1, 10], [60000, 1, 3, 0, 2, None]])
+
+        self.assertEqual([row.to_dict() for row in candles.rows()], candles.records())
+
+    def test_records_are_not_slower_than_zipped_dicts(self):
+        candles = Candles.from_rows([[t * 60000, 1, 2, 0, 1, 10] for t in range(1000)])
+
+        def zipped():
+            return [dict(zip(Candles.COLUMNS, values)) for values in zip(*candles.columns().values())]
+
+        self.assertLessEqual(min(repeat(candles.records, number=20, repeat=5)), min(repeat(zipped, number=20, repeat=5)) * 1.2)
+
+
+class FakeExchange:
+    id = 'fake'
+
+    def __init__(self, now: int, rows: list):
+        self.now = now
+        self.rows = rows
+        self.calls = 0
+
+    def parse_timeframe(self, timeframe: str) -> int:
+        return 60
+
+    def milliseconds(self) -> int:
+        return self.now
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.calls += 1
+
+        return [row for row in self.rows if row[0] >= since][:limit]
+
+
+class CandleStoreTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        CandleStore.series.clear()
+
+    async def test_empty_responses_leave_a_gap(self):
+        exchange = FakeExchange(600000, [])
+
+        self.assertEqual(0, len(await CandleStore.fetch(exchange, 'BTC/USDT', '1m', 0, 5)))
+
+        exchange.rows = [[t * 60000, 1, 1, 1, 1, 1] for t in range(10)]
+
+        self.assertEqual(5, len(await CandleStore.fetch(exchange, 'BTC/USDT', '1m', 0, 5)))
+        self.assertEqual(2, exchange.calls)
+
+    async def test_covers_only_returned_rows(self):
+        exchange = FakeExchange(600000, [[t * 60000, 1, 1, 1, 1, 1] for t in range(3)])
+
+        await CandleStore.fetch(exchange, 'BTC/USDT', '1m', 0, 5)
+
+        self.assertEqual([[0, 180000]], CandleStore.get('fake', 'BTC/USDT', '1m', 60000).ranges)
+
+
+if __name__ == '__main__':
+    unittest.main()
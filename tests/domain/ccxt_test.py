@@ -0,0 +1,112 @@
+import asyncio
+import unittest
+
+from os import environ
+from ccxt import RequestTimeout
+from ccxt.async_support import binance
+
+from domain.breaker import CircuitBreaker
+from domain.ccxt import CCXTProxy
+from domain.errors import MinOrderAmount
+from domain.limits import Limits
+from domain.retry import RetryPolicy
+
+
+class CCXTProxyTest(unittest.IsolatedAsyncioTestCase):
+    MARKET = {
+        'id': 'BTCUSDT',
+        'symbol': 'BTC/USDT',
+        'base': 'BTC',
+        'quote': 'USDT',
+        'spot': True,
+        'type': 'spot',
+        'precision': {'amount': 0.001, 'price': 0.01},
+        'limits': {'amount': {'min': 0.01}, 'cost': {'min': 5}},
+    }
+
+    def setUp(self):
+        self.proxy = CCXTProxy('binance', binance(), Limits({'binance': 10}))
+        self.proxy.retry = RetryPolicy(attempts=1)
+        self.proxy.exchange.set_markets([self.MARKET])
+
+    async def asyncTearDown(self):
+        await self.proxy.close()
+
+    async def test_timeouts_trip_the_breaker(self):
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(1)
+
+        self.proxy.breaker = CircuitBreaker('binance')
+        self.proxy.transport = hang
+
+        environ['CCXT_TIMEOUT_FETCH'] = '10'
+        environ['CCXT_BREAKER_CALLS'] = '2'
+
+        try:
+            for _ in range(2):
+                with self.assertRaises(RequestTimeout):
+                    await self.proxy._call('fetch', 'https://api.binance.com/api/v3/time')
+        finally:
+            del environ['CCXT_TIMEOUT_FETCH']
+            del environ['CCXT_BREAKER_CALLS']
+
+        self.assertEqual(CircuitBreaker.OPEN, self.proxy.breaker.state)
+
+    async def create_order(self, client_id: str) -> dict:
+        sent = {}
+
+        async def create_order(symbol, type, side, amount, price=None, params=None):
+            sent.update(params)
+
+            return {'id': '1', 'symbol': symbol, 'clientOrderId': params.get('clientOrderId')}
+
+        self.proxy.exchange.create_order = create_order
+
+        await self.proxy._create_order('BTC/USDT', 'limit', 'buy', 1, 100, client_id)
+
+        return sent
+
+    async def test_forwards_client_order_id_where_supported(self):
+        self.assertEqual({'clientOrderId': 'abc'}, await self.create_order('abc'))
+
+    async def test_keeps_client_order_id_local_elsewhere(self):
+        environ['CCXT_CLIENT_ORDER_ID'] = 'okx'
+
+        try:
+            self.assertEqual({}, await self.create_order('abc'))
+        finally:
+            del environ['CCXT_CLIENT_ORDER_ID']
+
+    def test_timeframe_falls_back_to_a_supported_one(self):
+        self.assertEqual('1h', self.proxy.timeframe('1h'))
+        self.assertIn(self.proxy.timeframe('abc'), self.proxy.exchange.timeframes)
+
+    def test_validate_rounds_to_precision(self):
+        self.assertEqual((0.123, 100.12), self.proxy._validate(self.MARKET, 0.12345, 100.12345))
+
+    def test_validate_rejects_small_amounts(self):
+        with self.assertRaises(MinOrderAmount):
+            self.proxy._validate(self.MARKET, 0.009, 10000)
+
+    def test_validate_rejects_small_costs(self):
+        # Above the market's own cost limit, below the one from the limits table
+        with self.assertRaises(MinOrderAmount):
+            self.proxy._validate(self.MARKET, 0.1, 80)
+
+        # Only short of the minimum once rounded
+        with self.assertRaises(MinOrderAmount):
+            self.proxy._validate(self.MARKET, 0.1009, 99.994)
+
+        self.proxy.limits.swap({})
+
+        self.assertEqual((0.1, 80), self.proxy._validate(self.MARKET, 0.1, 80))
+
+    def test_validate_market_orders_without_price(self):
+        self.assertEqual((0.02, None), self.proxy._validate(self.MARKET, 0.02, None))
+
+        with self.assertRaises(MinOrderAmount):
+            self.proxy._validate(self.MARKET, 0.001, None)
+
+
+if __name__ == '__main__':
+    unittest.main()
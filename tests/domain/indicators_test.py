@@ -0,0 +1,109 @@
+import unittest
+import numpy as np
+
+from time import time
+from domain.errors import InvalidIndicator
+from domain.indicators import IndicatorEngine, IndicatorState, IndicatorSpec, IndicatorBatch
+from domain.models import Candles
+
+
+class IndicatorEngineTest(unittest.TestCase):
+    TIMEFRAME = 60000
+
+    def setUp(self):
+        IndicatorEngine.states.clear()
+
+        now = int(time() * 1000)
+        current = now - now % self.TIMEFRAME
+        random = np.random.RandomState(7)
+
+        t = current - np.arange(600)[::-1] * self.TIMEFRAME
+        c = 100 + np.cumsum(random.normal(0, 1, 600))
+        v = random.rand(600) * 10
+
+        self.data = np.vstack([t, c, c, c, c, v]).astype(float)
+
+    def assertMatchesTalib(self, candles: Candles, values: dict):
+        expected = IndicatorEngine.talib(candles, 12, 26, 9)
+
+        for key, value in expected.items():
+            self.assertAlmostEqual(value, values[key], places=8, msg=key)
+
+    def test_state_matches_talib(self):
+        candles = Candles(self.data)
+        state = IndicatorState(12, 26, 9)
+
+        for i in range(len(candles)):
+            state.update(int(candles.t[i]), candles.c[i], candles.v[i])
+
+        self.assertMatchesTalib(candles, state.values)
+
+    def test_incremental_updates_match_talib(self):
+        IndicatorEngine.compute(('test',), Candles(self.data[:, :500]), self.TIMEFRAME, 12, 26, 9)
+
+        for shift in (1, 2, 50, 100):
+            candles = Candles(self.data[:, shift:500 + shift])
+            values = IndicatorEngine.compute(('test',), candles, self.TIMEFRAME, 12, 26, 9)
+
+            self.assertTrue(IndicatorEngine.states[('test', 12, 26, 9)].verified)
+            self.assertMatchesTalib(candles, values)
+
+    def test_rejects_periods_talib_rejects(self):
+        with self.assertRaises(InvalidIndicator):
+            IndicatorEngine.compute(('test',), Candles(self.data[:, :100]), self.TIMEFRAME, 1, 26, 9)
+
+    def test_states_are_bounded(self):
+        candles = Candles(self.data[:, :100])
+        IndicatorEngine.SIZE = 2
+
+        try:
+            for fast in (10, 11, 12):
+                IndicatorEngine.compute(('test',), candles, self.TIMEFRAME, fast, 26, 9)
+        finally:
+            IndicatorEngine.SIZE = 1024
+
+        self.assertEqual([('test', 11, 26, 9), ('test', 12, 26, 9)], list(IndicatorEngine.states))
+
+
+class IndicatorBatchTest(unittest.TestCase):
+    def setUp(self):
+        IndicatorBatch.results.clear()
+
+        c = 100 + np.cumsum(np.random.RandomState(7).normal(0, 1, 100))
+        self.candles = Candles(np.vstack([np.arange(100) * 60000, c, c + 1, c - 1, c, np.ones(100)]).astype(float))
+
+    def test_parse_positional_and_named_params(self):
+        spec = IndicatorSpec.parse('bbands:20,nbdevup=1.5')
+
+        self.assertEqual('BBANDS', spec.name)
+        self.assertEqual({'timeperiod': 20, 'nbdevup': 1.5}, spec.params)
+        self.assertEqual(['upperband', 'middleband', 'lowerband'], spec.outputs)
+
+    def test_parse_rejects_invalid_specs(self):
+        for value in ('nope', 'rsi:x', 'rsi:14,1,2', 'rsi:period=14', 'mavp:5'):
+            with self.assertRaises(InvalidIndicator, msg=value):
+                IndicatorSpec.parse(value)
+
+    def test_compute_last_values(self):
+        specs = [IndicatorSpec.parse('rsi:14'), IndicatorSpec.parse('macd')]
+        values = IndicatorBatch.compute(('test',), self.candles, specs)
+
+        self.assertEqual({'rsi:14', 'macd'}, set(values))
+        self.assertEqual({'macd', 'macdsignal', 'macdhist'}, set(values['macd']))
+        self.assertTrue(0 <= values['rsi:14']['real'] <= 100)
+
+    def test_compute_full_series(self):
+        values = IndicatorBatch.compute(('test',), self.candles, [IndicatorSpec.parse('sma:10')], True)
+
+        self.assertEqual(100, len(values['sma:10']['real']))
+        self.assertEqual([None] * 9, values['sma:10']['real'][:9])
+
+    def test_compute_rejects_bad_params(self):
+        with self.assertRaises(InvalidIndicator):
+            IndicatorBatch.compute(('test',), self.candles, [IndicatorSpec.parse('rsi:-5')])
+
+        self.assertEqual(0, len(IndicatorBatch.results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import asyncio
+import sqlite3
+import tempfile
+import unittest
+
+from os import environ, path
+
+from domain.limits import LimitsSource
+
+
+class LimitsSourceTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        self.filename = path.join(directory.name, 'limits.db')
+
+        environ['CCXT_LIMITS_DSN'] = 'sqlite:///' + self.filename
+        self.addCleanup(environ.pop, 'CCXT_LIMITS_DSN')
+
+        LimitsSource.limits.swap({})
+        LimitsSource.stats.update(loads=0, failures=0, changes=0, size=0, duration=None, loaded=None, error=None)
+
+    async def asyncTearDown(self):
+        await LimitsSource.stop()
+
+    def execute(self, *queries):
+        conn = sqlite3.connect(self.filename)
+
+        try:
+            for query in queries:
+                conn.execute(query)
+
+            conn.commit()
+        finally:
+            conn.close()
+
+    async def wait(self, condition):
+        async def poll():
+            while not condition():
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(poll(), 5)
+
+    def create(self):
+        self.execute("CREATE TABLE ExchangeSettings (Exchange TEXT, MinOrderAmount REAL)")
+
+    async def test_refresh_swaps_changed_limits(self):
+        self.create()
+        self.execute("INSERT INTO ExchangeSettings VALUES ('binance', 10), ('kraken', 5)")
+
+        limits = LimitsSource.limits.values
+
+        self.assertTrue(await LimitsSource.refresh())
+        self.assertEqual({'binance': 10.0, 'kraken': 5.0}, LimitsSource.limits.values)
+
+        # Readers holding the previous table are not affected by the swap
+        self.assertEqual({}, limits)
+
+        self.assertFalse(await LimitsSource.refresh())
+
+        self.execute("UPDATE ExchangeSettings SET MinOrderAmount = 20 WHERE Exchange = 'binance'")
+
+        self.assertTrue(await LimitsSource.refresh())
+        self.assertEqual(20.0, LimitsSource.limits.values['binance'])
+        self.assertEqual(3, LimitsSource.stats['loads'])
+        self.assertEqual(2, LimitsSource.stats['changes'])
+        self.assertEqual(2, LimitsSource.stats['size'])
+        self.assertIsNone(LimitsSource.stats['error'])
+
+    async def test_failed_refresh_keeps_limits(self):
+        LimitsSource.limits.swap({'binance': 10.0})
+
+        with self.assertLogs('domain.limits'):
+            self.assertFalse(await LimitsSource.refresh())
+
+        self.assertEqual({'binance': 10.0}, LimitsSource.limits.values)
+        self.assertEqual(1, LimitsSource.stats['failures'])
+        self.assertIn('ExchangeSettings', LimitsSource.stats['error'])
+
+    async def test_retries_failed_loads_sooner(self):
+        environ['CCXT_LIMITS_RETRY'] = '0.01'
+        self.addCleanup(environ.pop, 'CCXT_LIMITS_RETRY')
+
+        with self.assertLogs('domain.limits'):
+            LimitsSource.start()
+
+            await self.wait(lambda: LimitsSource.stats['failures'] >= 2)
+
+        self.create()
+        self.execute("INSERT INTO ExchangeSettings VALUES ('binance', 10)")
+
+        await self.wait(lambda: LimitsSource.stats['loads'] >= 1)
+
+        self.assertEqual({'binance': 10.0}, LimitsSource.limits.values)
+        self.assertIsNone(LimitsSource.stats['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
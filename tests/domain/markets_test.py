@@ -0,0 +1,52 @@
+import asyncio
+import unittest
+
+from ccxt.async_support import binance
+
+from domain.ccxt import CCXTProxy
+from domain.limits import Limits
+from domain.markets import MarketsCache
+
+
+class FakeBinance(binance):
+    downloads = 0
+
+    async def load_markets(self, reload=False, params={}):
+        FakeBinance.downloads += 1
+
+        await asyncio.sleep(0.01)
+
+        self.set_markets([{'id': 'BTCUSDT', 'symbol': 'BTC/USDT', 'base': 'BTC', 'quote': 'USDT', 'spot': True}])
+
+        return self.markets
+
+
+class MarketsCacheTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        FakeBinance.downloads = 0
+        MarketsCache.invalidate()
+
+        self.proxies = [CCXTProxy('binance', FakeBinance(), Limits()) for _ in range(3)]
+
+    async def asyncTearDown(self):
+        for proxy in self.proxies:
+            await proxy.close()
+
+    async def test_concurrent_cold_loads_download_once(self):
+        markets = await asyncio.gather(*[proxy.markets() for proxy in self.proxies * 2])
+
+        self.assertEqual(1, FakeBinance.downloads)
+        self.assertEqual({'BTC/USDT'}, {symbol for m in markets for symbol in m})
+
+    async def test_new_instances_are_seeded_from_the_cache(self):
+        await self.proxies[0].markets()
+
+        proxy = CCXTProxy('binance', FakeBinance(), Limits())
+        self.proxies.append(proxy)
+
+        self.assertEqual(['BTC/USDT'], await proxy.symbols())
+        self.assertEqual(1, FakeBinance.downloads)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+from core.helpers.payload import project
+from domain.models import Ticker, Order, OrderFee, TradeItem
+
+
+class ModelsTest(unittest.TestCase):
+    def test_orders_keep_ccxt_keys(self):
+        order = Order.map({
+            'id': '1',
+            'datetime': '2020-01-01T00:00:00.000Z',
+            'lastTradeTimestamp': 1577836800000,
+            'trades': [{'id': 't', 'fee': {'currency': 'BTC', 'cost': 0.1}}],
+            'fee': {'currency': 'BTC', 'cost': 0.1},
+            'info': {},
+        }).to_dict()
+
+        self.assertEqual(1577836800000, order['lastTradeTimestamp'])
+        self.assertEqual('2020-01-01T00:00:00.000Z', order['datetime'])
+        self.assertEqual(OrderFee('BTC', 0.1), order['trades'][0].fee)
+        self.assertNotIn('info', order)
+
+    def test_project_models(self):
+        tickers = {'BTC/USDT': Ticker.map({'symbol': 'BTC/USDT', 'bid': 1.0, 'ask': 2.0})}
+        trades = [TradeItem.map({'id': 't', 'price': 1.0, 'amount': 2.0})]
+
+        self.assertEqual({'BTC/USDT': {'symbol': 'BTC/USDT', 'bid': 1.0}}, project(tickers, ('symbol', 'bid')))
+        self.assertEqual([{'price': 1.0}], project(trades, ('price',)))
+
+    def test_trade_columns_flatten_the_fee(self):
+        trades = [
+            TradeItem.map({'id': '1', 'price': 1.0, 'fee': {'currency': 'BTC', 'cost': 0.1, 'rate': 0.001}, 'fees': []}),
+            TradeItem.map({'id': '2', 'price': 2.0}),
+        ]
+        columns = TradeItem.columns(trades)
+
+        self.assertNotIn('fee', columns)
+        self.assertNotIn('fees', columns)
+        self.assertEqual(['1', '2'], columns['id'])
+        self.assertEqual(['BTC', None], columns['fee_currency'])
+        self.assertEqual([0.1, None], columns['fee_cost'])
+        self.assertEqual([0.001, None], columns['fee_rate'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+from domain.models import Offer
+from domain.orderbook import LocalBook
+
+
+class LocalBookTest(unittest.TestCase):
+    def setUp(self):
+        self.book = LocalBook.parse({
+            'bids': [[99.7, 2], [100, 1], [99.2, 3]],
+            'asks': [[101, 1], [100.5, 2], [102, 0]],
+            'nonce': 1,
+        })
+
+    def test_snapshot_sorts_levels(self):
+        book = self.book.book()
+
+        self.assertEqual([100, 99.7, 99.2], [o.price for o in book.bids])
+        self.assertEqual([100.5, 101], [o.price for o in book.asks])
+
+    def test_apply_deltas(self):
+        self.book.apply([[99.7, 0], [100.2, 1]], [[100.5, 1.5]], nonce=2)
+        self.book.apply([[90, 1]], [], nonce=2)
+
+        book = self.book.book()
+
+        self.assertEqual([[100.2, 1], [100, 1], [99.2, 3]], [[o.price, o.amount] for o in book.bids])
+        self.assertEqual([[100.5, 1.5], [101, 1]], [[o.price, o.amount] for o in book.asks])
+
+    def test_changes_rebuild_the_snapshot(self):
+        snapshot = {'bids': [[100, 1], [99.2, 4], [98, 1]], 'asks': [[100.5, 2], [101.5, 1]]}
+        changes = self.book.changes(snapshot)
+
+        self.assertEqual(sorted([[99.7, 0], [99.2, 4], [98, 1]]), sorted(changes['bids']))
+        self.assertEqual(sorted([[101, 0], [101.5, 1]]), sorted(changes['asks']))
+
+        self.book.apply(changes['bids'], changes['asks'])
+
+        book = self.book.book()
+
+        self.assertEqual(snapshot['bids'], [[o.price, o.amount] for o in book.bids])
+        self.assertEqual(snapshot['asks'], [[o.price, o.amount] for o in book.asks])
+        self.assertEqual({'bids': [], 'asks': []}, self.book.changes(snapshot))
+
+    def test_group_and_depth(self):
+        book = self.book.book(depth=1, group=0.5)
+
+        self.assertEqual([Offer(100, 1)], book.bids)
+        self.assertEqual([Offer(100.5, 2)], book.asks)
+        self.assertEqual([Offer(99.5, 2), Offer(99, 3)], self.book.book(group=0.5).bids[1:])
+
+    def test_impact(self):
+        buy = self.book.impact(LocalBook.BUY, 2.5)
+        sell = self.book.impact(LocalBook.SELL, 10)
+
+        self.assertAlmostEqual(100.6, buy['vwap'])
+        self.assertEqual(2, buy['levels'])
+        self.assertTrue(buy['complete'])
+        self.assertEqual(6, sell['filled'])
+        self.assertFalse(sell['complete'])
+
+
+if __name__ == '__main__':
+    unittest.main()
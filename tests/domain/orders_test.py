@@ -0,0 +1,34 @@
+import asyncio
+import unittest
+
+from domain.orders import OrderIndex
+
+
+class OrderIndexTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.calls = 0
+
+        OrderIndex.entries.clear()
+
+    async def place(self):
+        self.calls += 1
+
+        await asyncio.sleep(0.01)
+
+        return {'id': str(self.calls)}
+
+    async def test_duplicates_return_the_original_order(self):
+        key = OrderIndex.key('binance', 'key', 'abc')
+
+        orders = await asyncio.gather(*[OrderIndex.place(key, self.place) for _ in range(3)])
+        again = await OrderIndex.place(key, self.place)
+
+        self.assertEqual(1, self.calls)
+        self.assertEqual([{'id': '1'}] * 4, orders + [again])
+
+    def test_keys_are_scoped_by_account(self):
+        self.assertNotEqual(OrderIndex.key('binance', 'a', 'abc'), OrderIndex.key('binance', 'b', 'abc'))
+
+
+if __name__ == '__main__':
+    unittest.main()
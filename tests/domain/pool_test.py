@@ -0,0 +1,57 @@
+import unittest
+
+from domain.pool import ExchangePool
+
+
+class FakeProxy:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class ExchangePoolTest(unittest.IsolatedAsyncioTestCase):
+    def load(self):
+        async def loader():
+            return FakeProxy()
+
+        return loader
+
+    async def test_reuses_instances(self):
+        pool = ExchangePool(size=4, idle=60)
+
+        first = await pool.acquire(('binance', ''), self.load())
+        pool.release(('binance', ''))
+        second = await pool.acquire(('binance', ''), self.load())
+
+        self.assertIs(first, second)
+
+    async def test_evicts_over_capacity(self):
+        pool = ExchangePool(size=1, idle=60)
+
+        first = await pool.acquire(('binance', ''), self.load())
+        pool.release(('binance', ''))
+        await pool.acquire(('kraken', ''), self.load())
+
+        self.assertTrue(first.closed)
+        self.assertEqual([('kraken', '')], list(pool.entries))
+
+    async def test_keeps_busy_instances(self):
+        pool = ExchangePool(size=1, idle=60)
+
+        first = await pool.acquire(('binance', ''), self.load())
+        await pool.acquire(('kraken', ''), self.load())
+
+        self.assertFalse(first.closed)
+
+    def test_fingerprint_by_credentials(self):
+        self.assertEqual('', ExchangePool.fingerprint({}))
+        self.assertNotEqual(
+            ExchangePool.fingerprint({'apiKey': 'a', 'secret': 'b'}),
+            ExchangePool.fingerprint({'apiKey': 'a', 'secret': 'c'}),
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
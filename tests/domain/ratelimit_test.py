@@ -0,0 +1,38 @@
+import unittest
+
+from domain.ratelimit import SharedBuckets
+
+
+class SharedBucketsTest(unittest.TestCase):
+    def setUp(self):
+        self.buckets = SharedBuckets(16)
+
+    def test_spaces_calls_by_interval(self):
+        delays = [self.buckets.reserve('binance:', 0.1) for _ in range(3)]
+
+        self.assertEqual(0, delays[0])
+        self.assertAlmostEqual(0.1, delays[1], places=2)
+        self.assertAlmostEqual(0.2, delays[2], places=2)
+
+    def test_burst_allows_calls_up_front(self):
+        delays = [self.buckets.reserve('binance:', 0.1, 2) for _ in range(3)]
+
+        self.assertEqual([0, 0], delays[:2])
+        self.assertAlmostEqual(0.1, delays[2], places=2)
+
+    def test_buckets_are_scoped_per_key(self):
+        self.buckets.reserve('binance:a', 0.1)
+
+        self.assertEqual(0, self.buckets.reserve('binance:b', 0.1))
+        self.assertEqual(0, self.buckets.reserve('kraken:a', 0.1))
+        self.assertGreater(self.buckets.reserve('binance:a', 0.1), 0)
+
+    def test_full_table_shares_buckets(self):
+        buckets = SharedBuckets(1)
+        buckets.reserve('binance:', 0.1)
+
+        self.assertGreater(buckets.reserve('kraken:', 0.1), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
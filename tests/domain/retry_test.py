@@ -0,0 +1,53 @@
+import unittest
+
+from ccxt import RequestTimeout, InvalidOrder
+
+from domain.retry import RetryPolicy, RetryBudget
+
+
+class RetryPolicyTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(attempts=3, base=0.001, cap=0.001, deadline=1)
+        self.calls = 0
+
+        RetryBudget.tokens.clear()
+
+    def flaky(self, error: Exception, failures: int):
+        async def call():
+            self.calls += 1
+
+            if self.calls <= failures:
+                raise error
+
+            return self.calls
+
+        return call
+
+    async def test_retries_network_errors(self):
+        result = await self.policy.run('binance', self.flaky(RequestTimeout('timeout'), 2))
+
+        self.assertEqual(3, result)
+
+    async def test_gives_up_after_attempts(self):
+        with self.assertRaises(RequestTimeout):
+            await self.policy.run('binance', self.flaky(RequestTimeout('timeout'), 5))
+
+        self.assertEqual(3, self.calls)
+
+    async def test_does_not_retry_venue_errors(self):
+        with self.assertRaises(InvalidOrder):
+            await self.policy.run('binance', self.flaky(InvalidOrder('rejected'), 1))
+
+        self.assertEqual(1, self.calls)
+
+    async def test_budget_is_shared_per_exchange(self):
+        RetryBudget.tokens['binance'] = 1
+
+        with self.assertRaises(RequestTimeout):
+            await self.policy.run('binance', self.flaky(RequestTimeout('timeout'), 5))
+
+        self.assertEqual(2, self.calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+
+from os import environ
+from unittest import mock
+
+from domain.errors import InvalidOperation
+from domain.models import Symbol, OrderBook, Offer, TradeItem
+from domain.streams import StreamClient, StreamHub, Feed, BookFeed, TradesFeed
+
+
+class StreamClientTest(unittest.IsolatedAsyncioTestCase):
+    async def test_drops_oldest_and_marks_feed_stale(self):
+        client = StreamClient(StreamClient.DROP, size=2)
+
+        for i in range(3):
+            client.push(('binance', 'book', 'BTC/USDT'), {'n': i})
+
+        self.assertEqual({('binance', 'book', 'BTC/USDT')}, client.stale)
+        self.assertEqual({'n': 1}, await client.next())
+        self.assertEqual({'n': 2}, await client.next())
+
+    async def test_closes_when_full(self):
+        client = StreamClient(StreamClient.CLOSE, size=1)
+
+        client.push(None, {'n': 0})
+        client.push(None, {'n': 1})
+        client.push(None, {'n': 2})
+
+        self.assertTrue(client.closed)
+        self.assertIsNone(await client.next())
+
+
+class FeedTest(unittest.TestCase):
+    def book(self, bids: list, asks: list) -> OrderBook:
+        return OrderBook([Offer(*level) for level in bids], [Offer(*level) for level in asks])
+
+    def test_book_snapshot_then_diffs(self):
+        feed = BookFeed('binance', Symbol('BTC', 'USDT'))
+
+        snapshot, = feed.update(self.book([[100, 1], [99, 2]], [[101, 1]]))
+
+        self.assertEqual('snapshot', snapshot['type'])
+        self.assertEqual([[100, 1], [99, 2]], [list(level) for level in snapshot['data']['bids']])
+        self.assertEqual([[101, 1]], [list(level) for level in snapshot['data']['asks']])
+
+        diff, = feed.update(self.book([[100, 3]], [[101, 1], [102, 5]]))
+
+        self.assertEqual('diff', diff['type'])
+        self.assertEqual(sorted([[100, 3], [99, 0]]), sorted(diff['data']['bids']))
+        self.assertEqual([[102, 5]], diff['data']['asks'])
+        self.assertEqual([], feed.update(self.book([[100, 3]], [[101, 1], [102, 5]])))
+
+    def test_trades_are_deduplicated(self):
+        feed = TradesFeed('binance', Symbol('BTC', 'USDT'))
+        first = [TradeItem(id='1', timestamp=1, price=1.0, amount=1.0), TradeItem(id='2', timestamp=2, price=1.0, amount=1.0)]
+        second = first[1:] + [TradeItem(id='3', timestamp=3, price=1.0, amount=1.0)]
+
+        self.assertEqual(first, feed.update(first)[0]['data'])
+        self.assertEqual(second[1:], feed.update(second)[0]['data'])
+        self.assertEqual([], feed.update(second))
+
+
+class StreamHubTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        StreamHub.feeds.clear()
+
+        # Feeds would otherwise start polling the venue as soon as a client joins
+        patcher = mock.patch.object(Feed, 'run', mock.AsyncMock())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_clients_share_feeds(self):
+        first, second = StreamClient(), StreamClient()
+
+        key = StreamHub.subscribe(first, 'binance', 'ticker', Symbol('BTC', 'USDT'))
+        StreamHub.subscribe(second, 'binance', 'ticker', Symbol('BTC', 'USDT'))
+
+        self.assertEqual([key], list(StreamHub.feeds))
+        self.assertEqual({first, second}, StreamHub.feeds[key].clients)
+
+        StreamHub.leave(first)
+
+        self.assertEqual({second}, StreamHub.feeds[key].clients)
+
+        StreamHub.leave(second)
+
+        self.assertEqual({}, StreamHub.feeds)
+
+    async def test_rejects_unknown_channels(self):
+        with self.assertRaises(InvalidOperation):
+            StreamHub.subscribe(StreamClient(), 'binance', 'nope', Symbol('BTC', 'USDT'))
+
+    async def test_candle_keys_carry_the_timeframe(self):
+        client = StreamClient()
+
+        key = StreamHub.subscribe(client, 'binance', 'ohlcv', Symbol('BTC', 'USDT'), timeframe='5m')
+
+        self.assertEqual(key, StreamHub.key('binance', 'ohlcv', Symbol('BTC', 'USDT'), timeframe='5m'))
+
+        StreamHub.unsubscribe(client, StreamHub.key('binance', 'ohlcv', Symbol('BTC', 'USDT'), timeframe='5m'))
+
+        self.assertEqual({}, StreamHub.feeds)
+
+    async def test_rejects_invalid_timeframes(self):
+        for timeframe in ('0m', 'abc'):
+            with self.assertRaises(InvalidOperation):
+                StreamHub.subscribe(StreamClient(), 'binance', 'ohlcv', Symbol('BTC', 'USDT'), timeframe=timeframe)
+
+        self.assertEqual({}, StreamHub.feeds)
+
+    async def test_limits_subscriptions_per_client(self):
+        client = StreamClient()
+        environ['CCXT_STREAM_FEEDS'] = '2'
+
+        try:
+            StreamHub.subscribe(client, 'binance', 'ticker', Symbol('BTC', 'USDT'))
+            StreamHub.subscribe(client, 'binance', 'trades', Symbol('BTC', 'USDT'))
+            StreamHub.subscribe(client, 'binance', 'ticker', Symbol('BTC', 'USDT'))
+
+            with self.assertRaises(InvalidOperation):
+                StreamHub.subscribe(client, 'binance', 'book', Symbol('BTC', 'USDT'))
+        finally:
+            del environ['CCXT_STREAM_FEEDS']
+
+        self.assertEqual(2, len(StreamHub.feeds))
+
+
+if __name__ == '__main__':
+    unittest.main()